@@ -1,12 +1,251 @@
+import os
+
 import streamlit as st
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-import plotly.express as px
+
+from swiggy import aggregates, charts, comoments, filters, ingest, instrument, sections, warehouse
+
+# Parsed uploads are shared by every session and keyed by content hash, so a
+# rerun (or a second analyst opening the same file) never re-parses the CSV.
+CACHE_MAX_DATASETS = 4
+CACHE_TTL = "2h"
+# DuckDB filter results are shared between sessions too; they are cheap to
+# rebuild, so keep only the most recent few.
+CACHE_MAX_VIEWS = 8
+CACHE_VIEW_TTL = "10m"
+# Computed sections (figures and tables), keyed by section and filter state.
+CACHE_MAX_SECTIONS = 256
+# Uploads larger than this default to streaming mode (chunked, aggregate-only).
+STREAMING_THRESHOLD_BYTES = 500 * 1024 * 1024
+PROCESSING_MODES = {
+    'memory': "In memory",
+    'streaming': "🌊 Streaming",
+    'duckdb': "🦆 DuckDB file",
+}
+# Every rerun is timed step by step (swiggy.instrument).  The breakdown is
+# shown in a sidebar panel when the URL has ?diagnostics=1 (or
+# SWIGGY_DIAGNOSTICS=1 is set), and appended as JSON lines to the file
+# named by SWIGGY_DIAGNOSTICS_LOG, if any.  Section payload sizes cost a
+# full serialization and are only measured in either of those cases.
+DIAGNOSTICS_KEY = 'diagnostics'
+# Records of section reruns that ran after the panel was drawn, kept for the
+# panel of the next full rerun (at most this many).
+SECTION_RERUNS_KEY = 'diagnostics_section_reruns'
+MAX_SECTION_RERUN_RECORDS = 1000
+DIAGNOSTICS_LOG = os.environ.get('SWIGGY_DIAGNOSTICS_LOG')
+
+
+@instrument.traced('ingest')
+@st.cache_resource(max_entries=CACHE_MAX_DATASETS, ttl=CACHE_TTL, show_spinner="Parsing CSV...")
+def load_dataset(fingerprint, _source):
+    _source.seek(0)
+    return ingest.load_csv(_source)
+
+
+@instrument.traced('filter.index')
+@st.cache_resource(max_entries=CACHE_MAX_DATASETS, ttl=CACHE_TTL, show_spinner="Indexing filters...")
+def filter_index(fingerprint, _df):
+    return filters.FilterIndex(_df)
+
+
+@instrument.traced('moments')
+@st.cache_resource(max_entries=CACHE_MAX_DATASETS, ttl=CACHE_TTL, show_spinner=False)
+def city_moments(fingerprint, _df):
+    # Per-City co-moments of the whole dataset; any city selection combines them.
+    return comoments.CoMoments.from_frame(_df, 'City')
+
+
+@instrument.traced('stream.scan')
+@st.cache_resource(max_entries=CACHE_MAX_DATASETS, ttl=CACHE_TTL, show_spinner="Scanning CSV in chunks...")
+def stream_overview(fingerprint, _source):
+    return aggregates.stream_stats(ingest.iter_csv(_source))
+
+
+@instrument.traced('stream.filter')
+@st.cache_data(max_entries=32, ttl=CACHE_TTL, show_spinner="Aggregating CSV in chunks...")
+def stream_filtered(fingerprint, _source, cities, rating_range, price_range, cuisines):
+    return aggregates.stream_stats(
+        ingest.iter_csv(_source),
+        predicate=lambda chunk: filters.mask(chunk, cities, rating_range, price_range, cuisines),
+    )
+
+
+@instrument.traced('duckdb.open')
+@st.cache_resource(max_entries=CACHE_MAX_DATASETS, ttl=CACHE_TTL, show_spinner="Loading CSV into DuckDB...")
+def open_warehouse(fingerprint, _source):
+    # One read-only connection per database file, shared by every session.
+    return warehouse.open_dataset(_source, fingerprint)
+
+
+@instrument.traced('duckdb.options')
+@st.cache_data(max_entries=CACHE_MAX_DATASETS, ttl=CACHE_TTL, show_spinner=False)
+def warehouse_options(fingerprint, _store):
+    cuisines = aggregates.CUISINE_DIMENSION if 'Food type' in _store.columns else None
+    return (_store.distinct('City'), _store.bounds('Avg ratings'), _store.bounds('Price'),
+            _store.distinct(cuisines) if cuisines else [])
+
+
+@instrument.traced('duckdb.query')
+@st.cache_resource(max_entries=CACHE_MAX_VIEWS, ttl=CACHE_VIEW_TTL, show_spinner="Querying DuckDB...")
+def warehouse_view(fingerprint, filter_state, _store):
+    view = _store.view(*filter_state)
+    view.totals  # run the shared aggregate scan once, inside the cache
+    return view
+
+
+@instrument.traced('kpi.aggregates')
+@st.cache_data(max_entries=64, ttl=CACHE_TTL, show_spinner=False)
+def group_aggregates(fingerprint, filter_state, _df, _rows=None, _cuisines=None):
+    # One groupby per dimension per filter state; every section reads from it.
+    # Only the grouped columns of the selected rows are copied.
+    columns = [column for column in aggregates.GROUP_DIMENSIONS + aggregates.METRICS if column in _df.columns]
+    return aggregates.GroupAggregates.from_frame(filters.view(_df[columns], _rows), cuisines=_cuisines)
+
+
+def sidebar_filters(cities, rating_bounds, price_max, cuisines):
+    city_options = st.sidebar.multiselect(
+        "Select City",
+        options=cities,
+        default=cities
+    )
+
+    rating_range = st.sidebar.slider(
+        "Select Rating Range",
+        min_value=0.0,
+        max_value=5.0,
+        value=rating_bounds,
+        step=0.1
+    )
+
+    price_range = st.sidebar.slider(
+        "Select Price Range",
+        min_value=0,
+        max_value=price_max,
+        value=(0, price_max)
+    )
+
+    cuisine_options = st.sidebar.multiselect(
+        "Select Cuisines",
+        options=cuisines,
+        help="Keep restaurants listing any of these cuisines. Leave empty to include all."
+    )
+    return city_options, rating_range, price_range, tuple(cuisine_options)
+
+
+def sidebar_chart_settings():
+    with st.sidebar.expander("⚙️ Chart Settings"):
+        scatter_mode = st.radio(
+            "Large scatter plots",
+            options=charts.SCATTER_MODES,
+            format_func={'density': "Density grid", 'sample': "Stratified sample"}.get,
+            help="How scatter plots are drawn when the filtered data has more rows than the limit below."
+        )
+        scatter_max_points = st.number_input(
+            "Scatter point limit",
+            min_value=1000,
+            value=charts.SCATTER_MAX_POINTS,
+            step=1000
+        )
+    return scatter_mode, int(scatter_max_points)
+
+
+def show_kpis(total_restaurants, unique_cities, average_rating, average_price):
+    st.header("Key Performance Indicators")
+    col1, col2, col3, col4 = st.columns(4)
+
+    col1.metric("Total Restaurants", total_restaurants)
+    col2.metric("Unique Cities", unique_cities)
+    col3.metric("Average Rating", f"{average_rating:.2f} / 5")
+    col4.metric("Average Price", f"₹ {average_price:.2f}")
+
+
+@st.cache_resource(max_entries=CACHE_MAX_SECTIONS, ttl=CACHE_VIEW_TTL, show_spinner="Computing section...")
+def section_blocks(key, state, _ctx, _measure_payload=False):
+    with instrument.span('compute'):
+        blocks = sections.get(key).compute(_ctx)
+    # Measured once per computed section; cached reruns skip it.
+    if _measure_payload:
+        with instrument.span('payload') as record:
+            if record is not None:
+                record['payload_kb'] = round(instrument.payload_size(blocks) / 1024, 1)
+    return blocks
+
+
+def render_blocks(blocks):
+    for kind, value in blocks:
+        if kind == 'subheader':
+            st.subheader(value)
+        elif kind == 'markdown':
+            st.markdown(value)
+        elif kind == 'info':
+            st.info(value)
+        elif kind == 'dataframe':
+            st.dataframe(value)
+        elif kind == 'plotly':
+            st.plotly_chart(value, width='stretch')
+        elif kind == 'image':
+            st.image(value, width='stretch')
+
+
+@st.fragment
+def section_panel(section, state, ctx):
+    # Nothing is computed until the expander is opened; opening or closing it
+    # reruns only this fragment, not the whole script.  Such a rerun comes
+    # after the full run's recorder finished and its panel was drawn, so it
+    # is timed by a recorder of its own and kept for the next panel.
+    recorder = st.session_state.get(DIAGNOSTICS_KEY)
+    rerun = recorder is not None and recorder.finished
+    if rerun:
+        recorder = instrument.Recorder(recorder.session)
+    instrument.activate(recorder)
+    panel = st.expander(section.title, key=f"section-{section.key}", on_change="rerun")
+    with panel:
+        if panel.open:
+            with instrument.span(f"section.{section.key}"):
+                blocks = section_blocks(section.key, state, ctx, bool(DIAGNOSTICS_LOG) or diagnostics_shown())
+                with instrument.span('render'):
+                    render_blocks(blocks)
+    if rerun:
+        recorder.finish('section rerun')
+        kept = st.session_state.setdefault(SECTION_RERUNS_KEY, [])
+        kept.extend(recorder.records)
+        del kept[:-MAX_SECTION_RERUN_RECORDS]
+    if DIAGNOSTICS_LOG and recorder is not None:
+        recorder.flush(DIAGNOSTICS_LOG)
+
+
+def show_sections(state, ctx):
+    for section in sections.available(ctx):
+        section_panel(section, state, ctx)
+
+
+def diagnostics_shown():
+    return st.query_params.get('diagnostics') in ('1', 'true') or os.environ.get('SWIGGY_DIAGNOSTICS') == '1'
+
+
+def diagnostics_panel(recorder, section_reruns=()):
+    with st.sidebar.expander("🩺 Diagnostics"):
+        run = recorder.records[-1]
+        st.caption(f"Last rerun: {run['wall_ms']:,.0f} ms wall, {run['cpu_ms']:,.0f} ms CPU, "
+                   f"{run['rss_delta_mb']:+,.1f} MB resident memory")
+        st.dataframe(recorder.frame(), hide_index=True)
+        if section_reruns:
+            st.caption("Sections opened or closed before this rerun")
+            st.dataframe(recorder.frame(section_reruns), hide_index=True)
+        st.download_button("Download JSON lines", recorder.to_jsonl([*section_reruns, *recorder.records]),
+                           file_name=f"swiggy-diagnostics-{recorder.run}.jsonl", mime="application/x-ndjson")
+
 
 # Set a wide layout and add a page title and icon
 st.set_page_config(layout="wide", page_title="Swiggy Data Analysis Dashboard", page_icon="🍔")
 
+# One recorder per full rerun; the session id carries over between reruns.
+previous_diagnostics = st.session_state.get(DIAGNOSTICS_KEY)
+diagnostics = instrument.Recorder(previous_diagnostics.session if previous_diagnostics is not None else None)
+st.session_state[DIAGNOSTICS_KEY] = diagnostics
+instrument.activate(diagnostics)
+section_reruns = st.session_state.pop(SECTION_RERUNS_KEY, [])
+
 # Custom CSS for a clean look
 st.markdown("""
 <style>
@@ -44,322 +283,173 @@ st.title("🍽️ Swiggy Data Analysis Dashboard")
 # --- Sidebar for File Upload and Filters ---
 st.sidebar.header("📁 Upload & Filter Data")
 uploaded_file = st.sidebar.file_uploader("Upload your Swiggy CSV", type="csv")
+modes = [mode for mode in PROCESSING_MODES if mode != 'duckdb' or warehouse.available()]
+mode = uploaded_file is not None and st.sidebar.radio(
+    "Processing mode",
+    options=modes,
+    index=1 if uploaded_file.size > STREAMING_THRESHOLD_BYTES else 0,
+    format_func=PROCESSING_MODES.get,
+    help="Streaming reads the CSV in chunks and shows only the KPIs and aggregate sections; "
+         "memory use stays flat no matter how large the file is. "
+         "DuckDB loads the CSV once into an on-disk database shared by all sessions "
+         "and runs filters and aggregations there as SQL."
+)
 
 df = None
-if uploaded_file is not None:
+rows = None
+selected = 0
+stream = None
+query = None
+if mode == 'streaming':
     try:
-        df = pd.read_csv(uploaded_file)
-        st.sidebar.success("✅ CSV Uploaded Successfully")
+        fingerprint = ingest.fingerprint(uploaded_file)
+        overview = stream_overview(fingerprint, uploaded_file)
+        st.sidebar.success("✅ CSV Scanned in Streaming Mode")
+        st.sidebar.caption(f"{overview.rows:,} rows, aggregated in chunks of {ingest.CHUNK_ROWS:,}")
 
-        # Create a copy for filtering to avoid modifying the original dataframe
-        filtered_df = df.copy()
+        st.sidebar.markdown("---")
+        st.sidebar.subheader("🔍 Filters")
+        if {'City', 'Avg ratings', 'Price'} <= overview.columns:
+            price_max = overview.total('Price', 'max')
+            cuisine_table = overview.group_table(aggregates.CUISINE_DIMENSION)
+            city_options, rating_range, price_range, cuisine_options = sidebar_filters(
+                sorted(overview.cities),
+                (float(overview.total('Avg ratings', 'min')), float(overview.total('Avg ratings', 'max'))),
+                1000 if pd.isna(price_max) else int(price_max),
+                [] if cuisine_table is None else sorted(cuisine_table.index)
+            )
+            stream_state = (tuple(city_options), rating_range, price_range, cuisine_options)
+            stream = stream_filtered(fingerprint, uploaded_file, *stream_state)
+        else:
+            st.warning("Streaming mode needs the 'City', 'Avg ratings' and 'Price' columns.")
+    except Exception as e:
+        st.error(f"An error occurred while processing the CSV file: {e}")
+elif mode == 'duckdb':
+    try:
+        fingerprint = ingest.fingerprint(uploaded_file)
+        store = open_warehouse(fingerprint, uploaded_file)
+        st.sidebar.success("✅ CSV Loaded into DuckDB")
+        st.sidebar.caption(f"{store.path.name} · {store.nbytes / 1e6:,.1f} MB on disk")
+
+        st.sidebar.markdown("---")
+        st.sidebar.subheader("🔍 Filters")
+        if {'City', 'Avg ratings', 'Price'} <= set(store.columns):
+            cities, rating_bounds, price_bounds, cuisines = warehouse_options(fingerprint, store)
+            rating_bounds = rating_bounds or (0.0, 5.0)
+            city_options, rating_range, price_range, cuisine_options = sidebar_filters(
+                cities,
+                (float(rating_bounds[0]), float(rating_bounds[1])),
+                int(price_bounds[1]) if price_bounds is not None else 1000,
+                cuisines
+            )
+            query_state = (tuple(city_options), rating_range, price_range, cuisine_options)
+            query = warehouse_view(fingerprint, query_state, store)
+        else:
+            st.warning("DuckDB mode needs the 'City', 'Avg ratings' and 'Price' columns.")
+    except Exception as e:
+        st.error(f"An error occurred while processing the CSV file: {e}")
+elif uploaded_file is not None:
+    try:
+        fingerprint = ingest.fingerprint(uploaded_file)
+        df, ingest_report = load_dataset(fingerprint, uploaded_file)
+        st.sidebar.success("✅ CSV Uploaded Successfully")
+        st.sidebar.caption(
+            f"{ingest_report.rows:,} rows · {ingest_report.nbytes / 1e6:,.1f} MB in memory "
+            f"(saved {ingest_report.saved_nbytes / 1e6:,.1f} MB, {ingest_report.saved_ratio:.0%})"
+        )
+
+        # The cached frame is shared between sessions: never modify it in place.
+        # Filtering below selects row ids; sections copy out only the columns
+        # they read (sections.SectionContext).
+        selected = len(df)
+        filter_state = None
+        cuisine_view = None
+        ranks = None
+        moments = None
 
         # Interactive Filters
         st.sidebar.markdown("---")
         st.sidebar.subheader("🔍 Filters")
         
         # Check if key columns exist before creating filters
-        if 'City' in filtered_df.columns and 'Avg ratings' in filtered_df.columns and 'Price' in filtered_df.columns:
-            city_options = st.sidebar.multiselect(
-                "Select City",
-                options=filtered_df['City'].unique(),
-                default=filtered_df['City'].unique()
-            )
-            
-            rating_range = st.sidebar.slider(
-                "Select Rating Range",
-                min_value=0.0,
-                max_value=5.0,
-                value=(filtered_df['Avg ratings'].min(), filtered_df['Avg ratings'].max()),
-                step=0.1
-            )
-            
-            price_max = int(filtered_df['Price'].max()) if 'Price' in filtered_df.columns and not filtered_df['Price'].isnull().all() else 1000
-            price_range = st.sidebar.slider(
-                "Select Price Range",
-                min_value=0,
-                max_value=price_max,
-                value=(0, price_max)
+        if 'City' in df.columns and 'Avg ratings' in df.columns and 'Price' in df.columns:
+            index = filter_index(fingerprint, df)
+            rating_bounds = index.rating.bounds() or (0.0, 5.0)
+            price_bounds = index.price.bounds()
+            city_options, rating_range, price_range, cuisine_options = sidebar_filters(
+                list(index.cities),
+                (float(rating_bounds[0]), float(rating_bounds[1])),
+                int(price_bounds[1]) if price_bounds is not None else 1000,
+                list(index.cuisines.cuisines) if index.cuisines is not None else []
             )
-            
+
             # Filter the DataFrame based on user selections
-            filtered_df = filtered_df[
-                (filtered_df['City'].isin(city_options)) &
-                (filtered_df['Avg ratings'] >= rating_range[0]) &
-                (filtered_df['Avg ratings'] <= rating_range[1]) &
-                (filtered_df['Price'] >= price_range[0]) &
-                (filtered_df['Price'] <= price_range[1])
-            ]
+            filter_state = (tuple(city_options), rating_range, price_range, cuisine_options)
+            with instrument.span('filter.select') as record:
+                rows = index.select(*filter_state)
+                if record is not None:
+                    record['rows'] = len(rows)
+            selected = len(rows)
+            ranks = index.ranking(*filter_state)
+            if index.city_only(*filter_state[1:]):
+                moments = city_moments(fingerprint, df).subset(city_options)
+            if index.cuisines is not None:
+                cuisine_view = index.cuisine_view(*filter_state)
         else:
             st.warning("Uploaded file is missing required columns: 'City', 'Avg ratings', or 'Price'. Filtering will not be available.")
+        chart_settings = sidebar_chart_settings()
     except Exception as e:
         st.error(f"An error occurred while processing the CSV file: {e}")
         df = None
-        filtered_df = pd.DataFrame()
+        selected = 0
 else:
     st.info("📂 Please upload your Swiggy CSV file to begin analysis.")
-    filtered_df = pd.DataFrame() # Create an empty DataFrame to avoid errors
+
+# --- Streaming Mode: KPIs and aggregate sections only ---
+if stream is not None and stream.rows:
+    show_kpis(stream.rows, len(stream.cities),
+              stream.total('Avg ratings', 'mean'), stream.total('Price', 'mean'))
+    st.markdown("---")
+    st.header("Visual Insights & Analysis")
+    st.caption("Streaming mode: only sections that can be computed from running aggregates are shown.")
+    show_sections((fingerprint, 'stream', stream_state), sections.SectionContext(groups=stream))
+
+elif stream is not None:
+    st.info("No restaurants match the current filters.")
+
+# --- DuckDB Mode: filters, aggregates and row lookups run as SQL ---
+elif query is not None and query.rows:
+    show_kpis(query.rows, len(query.group_table('City')),
+              query.total('Avg ratings', 'mean'), query.total('Price', 'mean'))
+    st.markdown("---")
+    st.header("Visual Insights & Analysis")
+    st.caption("DuckDB mode: sections are answered by SQL queries on the on-disk dataset; "
+               "large scatter plots are always drawn as density grids.")
+    show_sections((fingerprint, 'duckdb', query_state), sections.SectionContext(groups=query))
+
+elif query is not None:
+    st.info("No restaurants match the current filters.")
 
 # --- Main Dashboard Content ---
-if not filtered_df.empty:
-    st.header("Key Performance Indicators")
-    col1, col2, col3, col4 = st.columns(4)
-    
-    col1.metric("Total Restaurants", len(filtered_df))
-    col2.metric("Unique Cities", filtered_df['City'].nunique())
-    col3.metric("Average Rating", f"{filtered_df['Avg ratings'].mean():.2f} / 5")
-    col4.metric("Average Price", f"₹ {filtered_df['Price'].mean():.2f}")
+elif selected:
+    groups = group_aggregates(fingerprint, filter_state, df, rows, cuisine_view)
+
+    show_kpis(groups.rows, len(groups.group_table('City')),
+              groups.total('Avg ratings', 'mean'), groups.total('Price', 'mean'))
 
     with st.expander("📄 View Filtered Sample Data"):
         st.subheader("Filtered Sample Data")
-        st.dataframe(filtered_df.head(10))
+        st.dataframe(df.head(10) if rows is None else filters.view(df, rows[:10]))
 
     st.markdown("---")
     
     # --- All Visualizations in a Linear Layout ---
+    # Each section is computed only when its expander is opened.
     st.header("Visual Insights & Analysis")
-    
-    with st.expander("1. 📦 Price Distribution by City"):
-        fig1 = px.box(filtered_df, x='City', y='Price', color='City', title='Price Distribution by City',
-                      color_discrete_sequence=px.colors.sequential.Viridis,
-                      template="plotly_dark")
-        st.plotly_chart(fig1, use_container_width=True)
-        st.markdown(""">
-        - Median price across cities is ₹250–₹350
-        - Mumbai shows higher price variability
-        - All cities have outliers (up to ₹2500)
-        """)
-
-    with st.expander("2. ⭐ Price vs Average Rating"):
-        fig_plotly_scatter = px.scatter(filtered_df, x='Price', y='Avg ratings', color='City',
-                                        title='Price vs. Average Rating',
-                                        hover_data=['Restaurant', 'Food type'],
-                                        color_discrete_sequence=px.colors.qualitative.Plotly,
-                                        template="plotly_dark")
-        st.plotly_chart(fig_plotly_scatter, use_container_width=True)
-        st.markdown(""">
-        - Most listings are ₹100–₹500 with ratings 3.5–5.0
-        - No strong correlation between price and rating
-        """)
-
-    with st.expander("3. ⚠ Outlier Detection"):
-        st.subheader("Restaurants with ₹0 Price")
-        st.dataframe(filtered_df[filtered_df['Price'] == 0])
-        st.subheader("Restaurants with Price > ₹1300")
-        st.dataframe(filtered_df[filtered_df['Price'] > 1300])
-
-    with st.expander("4. 💰 Average Price by Food Type"):
-        st.subheader("Average Price by Food Type (Top 10)")
-        avg_price_by_food = filtered_df.groupby('Food type')['Price'].mean().sort_values(ascending=False).head(10)
-        fig_avg_price = px.bar(avg_price_by_food, x=avg_price_by_food.index, y=avg_price_by_food.values,
-                               title='Average Price by Food Type',
-                               color=avg_price_by_food.values,
-                               color_continuous_scale=px.colors.sequential.Plasma,
-                               template="plotly_dark")
-        fig_avg_price.update_layout(xaxis_title="Food Type", yaxis_title="Average Price")
-        st.plotly_chart(fig_avg_price, use_container_width=True)
-
-    with st.expander("5. 🌟 Top-Rated Restaurants by City"):
-        st.subheader("Top-Rated Restaurants by Average Rating (Top 10)")
-        st.dataframe(filtered_df.sort_values(by='Avg ratings', ascending=False)[['Restaurant', 'City', 'Avg ratings', 'Price']].head(10))
-
-    with st.expander("6. 🍽 Most Popular Cuisines (Top 10)"):
-        st.subheader("Most Popular Cuisines")
-        top_food_volume = filtered_df['Food type'].value_counts().head(10)
-        fig_volume = px.bar(top_food_volume, x=top_food_volume.values, y=top_food_volume.index,
-                            orientation='h', title='Most Popular Food Types',
-                            color_discrete_sequence=px.colors.qualitative.Vivid,
-                            template="plotly_dark")
-        fig_volume.update_layout(xaxis_title="Count", yaxis_title="Food Type")
-        st.plotly_chart(fig_volume, use_container_width=True)
-
-    with st.expander("7. 🕒 Delivery Time vs Rating"):
-        fig4 = px.scatter(filtered_df, x='Delivery time', y='Avg ratings', color='City',
-                          title='Delivery Time vs Rating',
-                          color_discrete_sequence=px.colors.qualitative.T10,
-                          template="plotly_dark")
-        st.plotly_chart(fig4, use_container_width=True)
-
-    with st.expander("8. 🥗 Cuisine Popularity vs Average Rating"):
-        st.subheader("Average Rating for Popular Cuisines (Top 10)")
-        cuisine_ratings = filtered_df.groupby('Food type')['Avg ratings'].mean().sort_values(ascending=False).head(10)
-        fig_cuisine_ratings = px.bar(cuisine_ratings, x=cuisine_ratings.values, y=cuisine_ratings.index,
-                                     orientation='h', title='Average Rating for Popular Cuisines',
-                                     color_discrete_sequence=px.colors.sequential.Blues, template="plotly_dark")
-        fig_cuisine_ratings.update_layout(xaxis_title="Average Rating", yaxis_title="Food Type")
-        st.plotly_chart(fig_cuisine_ratings, use_container_width=True)
-        st.dataframe(cuisine_ratings)
-
-    with st.expander("9. 🏙 Top Cities by Restaurant Count"):
-        st.subheader("Top 10 Cities by Restaurant Count")
-        city_counts = filtered_df['City'].value_counts().head(10)
-        fig_city = px.bar(city_counts, x=city_counts.index, y=city_counts.values,
-                          title='Top Cities by Restaurant Count',
-                          color_discrete_sequence=px.colors.qualitative.Pastel,
-                          template="plotly_dark")
-        fig_city.update_layout(xaxis_title="City", yaxis_title="Count")
-        st.plotly_chart(fig_city, use_container_width=True)
-
-    with st.expander("10. ⏱ Price vs Delivery Time"):
-        fig_plotly_price_delivery = px.scatter(filtered_df, x='Price', y='Delivery time', color='City',
-                                               title='Price vs. Delivery Time',
-                                               hover_data=['Restaurant'],
-                                               color_discrete_sequence=px.colors.qualitative.T10,
-                                               template="plotly_dark")
-        st.plotly_chart(fig_plotly_price_delivery, use_container_width=True)
-
-    with st.expander("11. 🧾 Price Distribution for Top 5 Food Types"):
-        top_foods = filtered_df['Food type'].value_counts().head(5).index
-        fig7 = px.box(filtered_df[filtered_df['Food type'].isin(top_foods)], x='Food type', y='Price', color='Food type',
-                      title='Price Distribution for Top 5 Food Types',
-                      color_discrete_sequence=px.colors.sequential.Sunset,
-                      template="plotly_dark")
-        st.plotly_chart(fig7, use_container_width=True)
-
-    with st.expander("12. 💸 Cheapest and Costliest Cities"):
-        st.subheader("Cheapest and Costliest Cities (by average price)")
-        city_price_agg = filtered_df.groupby('City')['Price'].agg(['min', 'max', 'mean']).reset_index()
-        fig_city_price = px.bar(city_price_agg.sort_values(by='mean', ascending=False), x='City', y='mean',
-                                color='City', title='Cheapest and Costliest Cities by Average Price',
-                                color_discrete_sequence=px.colors.qualitative.D3, template="plotly_dark")
-        fig_city_price.update_layout(xaxis_title="City", yaxis_title="Average Price")
-        st.plotly_chart(fig_city_price, use_container_width=True)
-        st.dataframe(city_price_agg.sort_values(by='mean', ascending=False))
-
-    with st.expander("13. ⭐ Rating Distribution per Food Type"):
-        st.subheader("Average Rating Distribution per Food Type")
-        fig8 = px.bar(filtered_df.groupby('Food type')['Avg ratings'].mean().sort_values(ascending=False).head(10),
-                      orientation='h', title='Average Rating per Food Type',
-                      color_discrete_sequence=px.colors.qualitative.Light24,
-                      template="plotly_dark")
-        st.plotly_chart(fig8, use_container_width=True)
-
-    with st.expander("14. 👎 Low-Rated Restaurants (Rating < 3.0)"):
-        st.subheader("Low-Rated Restaurants (Rating < 3.0)")
-        st.dataframe(filtered_df[filtered_df['Avg ratings'] < 3.0][['Restaurant', 'City', 'Avg ratings', 'Price']])
-    
-    if 'Area' in filtered_df.columns:
-        with st.expander("15. 🏘 Average Price by Area"):
-            st.subheader("Average Price by Area")
-            avg_price_by_area = filtered_df.groupby('Area')['Price'].mean().sort_values(ascending=False)
-            fig_avg_area_price = px.bar(avg_price_by_area, x=avg_price_by_area.index, y=avg_price_by_area.values,
-                                        title='Average Price by Area',
-                                        color=avg_price_by_area.values,
-                                        color_continuous_scale=px.colors.sequential.Viridis,
-                                        template="plotly_dark")
-            fig_avg_area_price.update_layout(xaxis_title="Area", yaxis_title="Average Price")
-            st.plotly_chart(fig_avg_area_price, use_container_width=True)
-
-    with st.expander("16. Correlation Matrix"):
-        st.subheader("Correlation between Price, Rating, and Delivery Time")
-        corr_df = filtered_df[['Price', 'Avg ratings', 'Delivery time']].dropna()
-        if not corr_df.empty:
-            fig_corr, ax_corr = plt.subplots(facecolor='#333333')
-            sns.heatmap(corr_df.corr(), annot=True, cmap='viridis', ax=ax_corr)
-            ax_corr.set_facecolor('#333333')
-            plt.tick_params(colors='#e0e0e0')
-            cbar = ax_corr.collections[0].colorbar
-            cbar.ax.yaxis.set_tick_params(color='#e0e0e0')
-            cbar.ax.yaxis.label.set_color('#e0e0e0')
-            cbar.ax.tick_params(axis='y', colors='#e0e0e0')
-            ax_corr.xaxis.label.set_color('#e0e0e0')
-            ax_corr.yaxis.label.set_color('#e0e0e0')
-            ax_corr.title.set_color('#FFD700')
-            ax_corr.xaxis.set_tick_params(color='#e0e0e0')
-            ax_corr.yaxis.set_tick_params(color='#e0e0e0')
-            st.pyplot(fig_corr)
-        else:
-            st.info("Insufficient data to calculate correlation.")
-
-    with st.expander("17. Price Trend by Cuisine Count"):
-        st.subheader("Price vs Cuisine Count")
-        filtered_df['Cuisine Count'] = filtered_df['Food type'].apply(lambda x: len(str(x).split(',')) if isinstance(x, str) else 0)
-        fig_cuisine_count = px.box(filtered_df, x='Cuisine Count', y='Price', color='Cuisine Count',
-                                   title='Price Distribution by Cuisine Count',
-                                   color_discrete_sequence=px.colors.sequential.Plasma,
-                                   template="plotly_dark")
-        st.plotly_chart(fig_cuisine_count, use_container_width=True)
-
-    with st.expander("18. Top Cities with Highest Average Ratings"):
-        st.subheader("Top Cities with Highest Average Ratings")
-        top_rating_cities = filtered_df.groupby('City')['Avg ratings'].mean().sort_values(ascending=False).head(10)
-        fig_top_rating_cities = px.bar(top_rating_cities, x=top_rating_cities.index, y=top_rating_cities.values,
-                                       title='Top Cities by Average Rating',
-                                       color=top_rating_cities.values,
-                                       color_continuous_scale=px.colors.sequential.Agsunset,
-                                       template="plotly_dark")
-        fig_top_rating_cities.update_layout(xaxis_title="City", yaxis_title="Average Rating")
-        st.plotly_chart(fig_top_rating_cities, use_container_width=True)
-        st.dataframe(top_rating_cities)
-
-    with st.expander("19. Delivery Time Distribution by City"):
-        st.subheader("Delivery Time Distribution by City")
-        fig_del_time = px.box(filtered_df, x='City', y='Delivery time', color='City',
-                              title='Delivery Time Distribution by City',
-                              color_discrete_sequence=px.colors.qualitative.T10,
-                              template="plotly_dark")
-        st.plotly_chart(fig_del_time, use_container_width=True)
-
-    with st.expander("20. Top Food Types by Volume"):
-        st.subheader("Top 20 Food Types by Volume")
-        top_food_volume = filtered_df['Food type'].value_counts().head(20)
-        fig_volume_20 = px.bar(top_food_volume, x=top_food_volume.index, y=top_food_volume.values,
-                               title='Top 20 Food Types by Volume',
-                               color=top_food_volume.values,
-                               color_continuous_scale=px.colors.sequential.Viridis,
-                               template="plotly_dark")
-        fig_volume_20.update_layout(xaxis_title="Food Type", yaxis_title="Count")
-        st.plotly_chart(fig_volume_20, use_container_width=True)
-
-    with st.expander("21. Average Delivery Time by Food Type"):
-        st.subheader("Average Delivery Time by Food Type (Top 10)")
-        delivery_by_food = filtered_df.groupby('Food type')['Delivery time'].mean().sort_values(ascending=False).head(10)
-        fig_delivery_by_food = px.bar(delivery_by_food, x=delivery_by_food.index, y=delivery_by_food.values,
-                                      title='Average Delivery Time by Food Type',
-                                      color=delivery_by_food.values,
-                                      color_continuous_scale=px.colors.sequential.Sunset,
-                                      template="plotly_dark")
-        fig_delivery_by_food.update_layout(xaxis_title="Food Type", yaxis_title="Average Delivery Time")
-        st.plotly_chart(fig_delivery_by_food, use_container_width=True)
-        st.dataframe(delivery_by_food)
-
-    with st.expander("22. Food Type vs Average Rating (Bar Chart)"):
-        st.subheader("Food Type vs Average Rating")
-        fig9 = px.bar(filtered_df.groupby('Food type')['Avg ratings'].mean().sort_values().tail(10),
-                      orientation='h', title='Top 10 Food Types by Average Rating',
-                      color_discrete_sequence=px.colors.sequential.Rainbow,
-                      template="plotly_dark")
-        st.plotly_chart(fig9, use_container_width=True)
-
-    with st.expander("23. Food Type vs Price Distribution (Box Plot)"):
-        st.subheader("Price Distribution for Top 10 Food Types")
-        top_food_types = filtered_df['Food type'].value_counts().head(10).index
-        fig10 = px.box(filtered_df[filtered_df['Food type'].isin(top_food_types)], x='Price', y='Food type',
-                       title='Price Distribution for Top 10 Food Types',
-                       color='Food type',
-                       color_discrete_sequence=px.colors.qualitative.G10,
-                       template="plotly_dark")
-        st.plotly_chart(fig10, use_container_width=True)
-
-    with st.expander("24. Cheapest Food Items"):
-        st.subheader("Cheapest Food Items (Top 10)")
-        cheapest_items = filtered_df[filtered_df['Price'] > 0].sort_values(by='Price').head(10)
-        st.dataframe(cheapest_items[['Restaurant', 'Food type', 'Price', 'City']])
-
-    with st.expander("25. Top 5 Food Types in Each City (Stacked Bar)"):
-        st.subheader("Top 5 Food Types in Each City")
-        top_cities = filtered_df['City'].value_counts().head(5).index
-        subset = filtered_df[filtered_df['City'].isin(top_cities)]
-        food_city_counts = pd.crosstab(subset['City'], subset['Food type'])
-        
-        common_food_types_in_top_cities = food_city_counts.sum(axis=0).sort_values(ascending=False).head(5).index
-        food_city_counts = food_city_counts[common_food_types_in_top_cities]
-
-        fig12 = px.bar(food_city_counts.T, x=food_city_counts.T.index, y=food_city_counts.T.columns,
-                       title="Top 5 Food Types in Top 5 Cities",
-                       template="plotly_dark")
-        fig12.update_layout(xaxis_title="Food Type", yaxis_title="Count")
-        st.plotly_chart(fig12, use_container_width=True)
+    scatter_mode, scatter_max_points = chart_settings
+    show_sections((fingerprint, filter_state, chart_settings),
+                  sections.SectionContext(df, groups, scatter_mode, scatter_max_points, cuisine_view,
+                                           ranks, moments, rows))
 
     # Summary
     st.markdown("""
@@ -371,3 +461,10 @@ if not filtered_df.empty:
 
 else:
     st.info("📂 Please upload your Swiggy CSV file to begin analysis.")
+
+# --- Diagnostics ---
+diagnostics.finish()
+if DIAGNOSTICS_LOG:
+    diagnostics.flush(DIAGNOSTICS_LOG)
+if diagnostics_shown():
+    diagnostics_panel(diagnostics, section_reruns)
@@ -0,0 +1,4 @@
+"""Data layer behind the Swiggy dashboard.
+
+Submodules are imported on demand so that ``import swiggy`` stays cheap.
+"""
@@ -0,0 +1,258 @@
+"""Per-group statistics shared by the dashboard sections.
+
+Each frame (or chunk of a frame) is reduced to a small table of partial
+statistics (count, sum, min, max per metric) per group.  Partials from
+different chunks combine associatively, so the same tables serve both the
+in-memory dashboard and the out-of-core streaming mode.
+"""
+import numpy as np
+import pandas as pd
+
+METRICS = ['Price', 'Avg ratings', 'Delivery time']
+GROUP_DIMENSIONS = ['City', 'Food type', 'Area']
+# Derived dimension: the individual cuisines listed in 'Food type' (see
+# swiggy.cuisines); a row belongs to every cuisine it lists.
+CUISINE_DIMENSION = 'Cuisine'
+# Derived dimension: how many cuisines a row lists (0 without a 'Food type').
+CUISINE_COUNT_DIMENSION = 'Cuisine Count'
+# (dimension, metric) pairs whose box-plot quantiles are sketched while
+# streaming.
+BOX_SKETCHES = [('City', 'Price'), ('City', 'Delivery time'), ('Food type', 'Price')]
+
+# How each partial statistic combines across chunks.
+_MERGE = {'count': 'sum', 'sum': 'sum', 'min': 'min', 'max': 'max'}
+_STATS = list(_MERGE)
+
+
+def group_codes(column):
+    """Integer group codes (-1 for missing) and the matching group keys."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy(), column.cat.categories
+    codes, keys = pd.factorize(column)
+    return codes, pd.Index(keys)
+
+
+def partial_stats(df, by=None):
+    """Partial statistics of ``df``, overall (one row) or per ``by`` group.
+
+    Columns are ``(metric, stat)`` pairs plus ``('rows', 'count')``.  All
+    metrics of a dimension are reduced in one pass over the group codes
+    with ``np.bincount`` / ``ufunc.at`` rather than one groupby per
+    statistic.
+    """
+    metrics = [column for column in METRICS if column in df.columns]
+    if by is None:
+        codes, keys = np.zeros(len(df), dtype=np.int8), pd.RangeIndex(1)
+    else:
+        codes, keys = group_codes(df[by])
+    valid = codes >= 0
+    if not valid.all():
+        codes = codes[valid]
+    size = len(keys)
+    rows = np.bincount(codes, minlength=size)
+    table = {('rows', 'count'): rows}
+    for metric in metrics:
+        values = df[metric].to_numpy(dtype='float64', na_value=np.nan)
+        if len(codes) != len(values):
+            values = values[valid]
+        present = ~np.isnan(values)
+        if present.all():
+            metric_codes, count = codes, rows
+        else:
+            metric_codes, values = codes[present], values[present]
+            count = np.bincount(metric_codes, minlength=size)
+        low = np.full(size, np.inf)
+        high = np.full(size, -np.inf)
+        np.minimum.at(low, metric_codes, values)
+        np.maximum.at(high, metric_codes, values)
+        empty = count == 0
+        low[empty] = high[empty] = np.nan
+        table[(metric, 'count')] = count
+        table[(metric, 'sum')] = np.bincount(metric_codes, weights=values, minlength=size)
+        table[(metric, 'min')] = low
+        table[(metric, 'max')] = high
+    table = pd.DataFrame(table, index=keys.rename(by))
+    return table[rows > 0] if by is not None else table
+
+
+def cuisine_stats(df, cuisines=None):
+    """Per-cuisine partial statistics, from ``cuisines`` (a
+    :class:`~swiggy.cuisines.CuisineIndex` aligned with ``df``) if given."""
+    # swiggy.cuisines builds on this module, hence the deferred import.
+    from swiggy.cuisines import CuisineIndex
+    if cuisines is None:
+        cuisines = CuisineIndex.from_series(df['Food type'])
+    return cuisines.partial_stats(df)
+
+
+def merge_partials(*tables):
+    """Combine partial-statistics tables produced by :func:`partial_stats`."""
+    tables = [table for table in tables if table is not None]
+    if not tables:
+        return None
+    combined = pd.concat(tables)
+    rules = {column: _MERGE[column[1]] for column in combined.columns}
+    return combined.groupby(level=0, sort=False).agg(rules)
+
+
+def finalize(table):
+    """Turn partial statistics into count/mean/min/max per metric."""
+    result = {('rows', 'count'): table[('rows', 'count')]}
+    for metric in table.columns.get_level_values(0).unique():
+        if metric == 'rows':
+            continue
+        count = table[(metric, 'count')]
+        result[(metric, 'count')] = count
+        result[(metric, 'mean')] = table[(metric, 'sum')] / count.where(count > 0)
+        result[(metric, 'min')] = table[(metric, 'min')]
+        result[(metric, 'max')] = table[(metric, 'max')]
+    return pd.DataFrame(result, index=table.index)
+
+
+class GroupAggregates:
+    """count/mean/min/max of every metric per group, for one filtered frame.
+
+    Built with a single groupby per dimension; sections then read their
+    slice with :meth:`group_table` instead of re-grouping the frame.
+    """
+
+    def __init__(self, totals, tables):
+        self.totals = totals
+        self.tables = tables
+
+    @classmethod
+    def from_frame(cls, df, dimensions=GROUP_DIMENSIONS, cuisines=None):
+        tables = {
+            dimension: finalize(partial_stats(df, dimension))
+            for dimension in dimensions if dimension in df.columns
+        }
+        if 'Food type' in df.columns:
+            tables[CUISINE_DIMENSION] = finalize(cuisine_stats(df, cuisines))
+        return cls(finalize(partial_stats(df)), tables)
+
+    @property
+    def rows(self):
+        return int(self.totals[('rows', 'count')].iloc[0])
+
+    def total(self, metric, stat):
+        """Overall ``stat`` (count/mean/min/max) of ``metric``."""
+        if (metric, stat) not in self.totals.columns:
+            return float('nan')
+        return self.totals[(metric, stat)].iloc[0]
+
+    def group_table(self, dimension):
+        """Per-group count/mean/min/max table for ``dimension``."""
+        return self.tables.get(dimension)
+
+
+class RunningStats:
+    """Folds chunks into overall and per-group statistics.
+
+    ``update`` consumes one chunk, ``merge`` combines two instances (e.g.
+    built over different files or in different processes).
+    """
+
+    def __init__(self, dimensions=GROUP_DIMENSIONS):
+        self.dimensions = list(dimensions)
+        self.totals = None
+        self.columns = set()
+        self.cities = set()
+        self.groups = {dimension: None for dimension in self.dimensions}
+        self.sketches = {}
+        # Per-City co-moments of the metrics, for the correlation matrix.
+        self.city_moments = None
+
+    def update(self, chunk):
+        self.totals = merge_partials(self.totals, partial_stats(chunk))
+        self.columns.update(chunk.columns)
+        if 'City' in chunk.columns:
+            self.cities.update(chunk['City'].dropna().unique())
+        for dimension in self.dimensions:
+            if dimension in chunk.columns:
+                self.groups[dimension] = merge_partials(self.groups[dimension], partial_stats(chunk, dimension))
+        if 'Food type' in chunk.columns:
+            self.groups[CUISINE_DIMENSION] = merge_partials(self.groups.get(CUISINE_DIMENSION), cuisine_stats(chunk))
+        for dimension, metric in BOX_SKETCHES:
+            if dimension in chunk.columns and metric in chunk.columns:
+                self._sketch((dimension, metric)).update(chunk[dimension], chunk[metric])
+        if {'City', *METRICS} <= set(chunk.columns):
+            self._merge_moments(self._co_moments(chunk))
+        return self
+
+    def merge(self, other):
+        self.totals = merge_partials(self.totals, other.totals)
+        self.columns |= other.columns
+        self.cities |= other.cities
+        for dimension in set(self.groups) | set(other.groups):
+            self.groups[dimension] = merge_partials(self.groups.get(dimension), other.groups.get(dimension))
+        if other.dimensions != self.dimensions:
+            self.dimensions = [dimension for dimension in self.groups if dimension != CUISINE_DIMENSION]
+        for key, sketch in other.sketches.items():
+            self._sketch(key).merge(sketch)
+        if other.city_moments is not None:
+            # Subsetting to every key copies, so ``other`` stays untouched.
+            self._merge_moments(other.city_moments.subset(other.city_moments.keys))
+        return self
+
+    @staticmethod
+    def _co_moments(chunk):
+        # swiggy.comoments builds on this module, hence the deferred import.
+        from swiggy.comoments import CoMoments
+        return CoMoments.from_frame(chunk, 'City')
+
+    def _merge_moments(self, moments):
+        if self.city_moments is None:
+            self.city_moments = moments
+        else:
+            self.city_moments.merge(moments)
+
+    def _sketch(self, key):
+        # swiggy.quantiles builds on this module, hence the deferred import.
+        from swiggy.quantiles import BoxSketch
+        if key not in self.sketches:
+            self.sketches[key] = BoxSketch()
+        return self.sketches[key]
+
+    @property
+    def rows(self):
+        return 0 if self.totals is None else int(self.totals[('rows', 'count')].iloc[0])
+
+    def total(self, metric, stat):
+        """Overall ``stat`` (count/mean/min/max) of ``metric``."""
+        if self.totals is None or (metric, 'count') not in self.totals.columns:
+            return float('nan')
+        return finalize(self.totals)[(metric, stat)].iloc[0]
+
+    def group_table(self, dimension):
+        """Per-group count/mean/min/max table for ``dimension``."""
+        table = self.groups.get(dimension)
+        if table is None:
+            return None
+        return finalize(table)
+
+    def has_box(self, dimension, metric):
+        return (dimension, metric) in self.sketches
+
+    @property
+    def has_moments(self):
+        return self.city_moments is not None
+
+    @property
+    def moments(self):
+        """Co-moments of the metrics over every folded row (with a City)."""
+        return self.city_moments
+
+    def box_summary(self, dimension, metric):
+        """Approximate box summary and outliers of ``metric`` per ``dimension``."""
+        return self.sketches[(dimension, metric)].summary(dimension, metric)
+
+
+def stream_stats(chunks, predicate=None, dimensions=GROUP_DIMENSIONS):
+    """Fold an iterable of chunks, optionally filtered row-wise by
+    ``predicate(chunk) -> boolean mask``, into a :class:`RunningStats`."""
+    stats = RunningStats(dimensions)
+    for chunk in chunks:
+        if predicate is not None:
+            chunk = chunk[predicate(chunk)]
+        stats.update(chunk)
+    return stats
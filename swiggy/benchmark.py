@@ -0,0 +1,211 @@
+"""Per-stage benchmarks of the dashboard pipeline.
+
+    python -m swiggy.benchmark [--rows N | --csv PATH] [--repeat R] [--save]
+
+Times ingestion, the filter index, KPI aggregation and every section
+(figure build plus serialization to what the browser receives) on
+synthetic data from :mod:`swiggy.synthetic`, records the peak memory
+allocated by each stage, and compares the results with a stored baseline
+(``benchmarks/baseline.json``).  The exit status is 1 if a stage got
+slower or hungrier than the baseline by more than the tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from swiggy import aggregates, charts, comoments, engine, filters, ingest, instrument, ranking, sections, synthetic  # noqa: E402,E501
+
+DEFAULT_ROWS = 100_000
+BASELINE = Path(__file__).resolve().parent.parent / 'benchmarks' / 'baseline.json'
+# A stage regresses when it is this many times slower (or larger) than
+# the baseline.
+TOLERANCE = 1.5
+# Stages faster than this are dominated by noise and only compared on memory.
+MIN_SECONDS = 0.005
+
+
+def measure(function, repeat):
+    """(best wall seconds over ``repeat`` runs, peak bytes, result).
+
+    A first run under ``tracemalloc`` records the peak allocation and
+    doubles as warm-up (lazy imports, caches); the timed runs that follow
+    happen without tracing.
+    """
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    best = float('inf')
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, peak, result
+
+
+def filter_states(df):
+    """A fixed set of sidebar states: unrestricted, two cities, a rating
+    band and a price band."""
+    cities = tuple(engine.cities(df))
+    ratings = (float(df['Avg ratings'].min()), float(df['Avg ratings'].max()))
+    prices = (float(df['Price'].min()), float(df['Price'].max()))
+    return [
+        (cities, ratings, prices),
+        (cities[:2], ratings, prices),
+        (cities, (4.0, ratings[1]), prices),
+        (cities, ratings, (100.0, 500.0)),
+    ]
+
+
+def run(path, repeat=5):
+    """Benchmark every stage on the CSV at ``path``; returns the row count
+    and ``{stage: record}``."""
+    stages = {}
+
+    def record(name, function, payload=None):
+        seconds, peak, result = measure(function, repeat)
+        stages[name] = {'seconds': round(seconds, 5), 'peak_mb': round(peak / 2 ** 20, 3)}
+        if payload is not None:
+            stages[name]['payload_kb'] = round(payload(result) / 1024, 1)
+        return result
+
+    df, _ = record('ingest', lambda: ingest.load_csv(path))
+    index = record('filter.index', lambda: filters.FilterIndex(df))
+    states = filter_states(df)
+
+    def select():
+        # Every memo (candidate sets, bitmaps, selections) is dropped before
+        # each run, so memoized answers do not count.
+        index.cache_clear()
+        return [index.select(*state) for state in states]
+
+    selections = record('filter.select', select)
+
+    def rank():
+        # Top-N and threshold queries of the row sections, per filter state,
+        # on fresh (unmemoized) rankings of the selections above.
+        return [(ranks.select(order_by='Avg ratings', ascending=False, limit=10),
+                 ranks.select([('Avg ratings', '<', 3.0)]),
+                 ranks.select([('Price', '>', 0)], order_by='Price', limit=10))
+                for ranks in (ranking.Ranking(index, rows) for rows in selections)]
+
+    record('filter.rank', rank)
+
+    def kpis():
+        groups = aggregates.GroupAggregates.from_frame(df)
+        return (groups.rows, len(groups.group_table('City')),
+                groups.total('Avg ratings', 'mean'), groups.total('Price', 'mean'))
+
+    record('kpi', kpis)
+    record('moments', lambda: comoments.CoMoments.from_frame(df, 'City'))
+    groups = aggregates.GroupAggregates.from_frame(df)
+
+    def compute(section):
+        # A fresh context and heatmap cache for every run: what a context
+        # memoizes (co-moments, cuisine index) and rendered images must not
+        # make the timed runs cheaper than the first.
+        charts._heatmap.cache_clear()
+        return instrument.payload_size(section.compute(sections.SectionContext(df, groups)))
+
+    for section in sections.available(engine.context(df)):
+        record(f"section.{section.key}", lambda: compute(section), payload=lambda size: size)
+    return len(df), stages
+
+
+def compare(stages, baseline, tolerance=TOLERANCE, stream=sys.stdout):
+    """Print current vs. baseline per stage; returns the regressed stage names."""
+    regressions = []
+    header = (f"{'stage':34s} {'seconds':>9s} {'baseline':>9s} {'ratio':>6s} {'peak MB':>8s} {'baseline':>9s} "
+              f"{'payload KB':>10s}")
+    print(header, file=stream)
+    print('-' * len(header), file=stream)
+    for name, current in stages.items():
+        payload = f"{current['payload_kb']:>10.1f}" if 'payload_kb' in current else f"{'':>10s}"
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:34s} {current['seconds']:>9.4f} {'-':>9s} {'':>6s} {current['peak_mb']:>8.2f} {'-':>9s} "
+                  f"{payload}", file=stream)
+            continue
+        ratio = current['seconds'] / before['seconds'] if before['seconds'] else float('nan')
+        slower = before['seconds'] >= MIN_SECONDS and ratio > tolerance
+        hungrier = current['peak_mb'] > max(before['peak_mb'], 1.0) * tolerance
+        flag = '  SLOWER' * slower + '  MORE MEMORY' * hungrier
+        if slower or hungrier:
+            regressions.append(name)
+        print(f"{name:34s} {current['seconds']:>9.4f} {before['seconds']:>9.4f} {ratio:>6.2f} "
+              f"{current['peak_mb']:>8.2f} {before['peak_mb']:>9.2f} {payload}{flag}", file=stream)
+    print('-' * len(header), file=stream)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m swiggy.benchmark', description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--rows', type=int, default=DEFAULT_ROWS, help="synthetic rows to generate")
+    source.add_argument('--csv', type=Path, help="benchmark this file instead of synthetic data")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per stage (best is kept)")
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--save', action='store_true', help="store the results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    parser.add_argument('--output', type=Path, help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.csv
+        if path is None:
+            path = Path(directory) / 'synthetic.csv'
+            synthetic.write_csv(path, args.rows, args.seed)
+        rows, stages = run(path, args.repeat)
+
+    results = {
+        'meta': {
+            'rows': rows,
+            'source': str(args.csv) if args.csv else f"synthetic(seed={args.seed})",
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+        },
+        'stages': stages,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + '\n')
+
+    status = 0
+    if args.baseline.exists() and not args.save:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline['meta']['rows'] != rows or baseline['meta']['source'] != results['meta']['source']:
+            print(f"Baseline was recorded on {baseline['meta']['rows']:,} rows of {baseline['meta']['source']}; "
+                  "not comparing.", file=sys.stderr)
+            compare(stages, {})
+        else:
+            regressions = compare(stages, baseline['stages'], args.tolerance)
+            if regressions:
+                print(f"{len(regressions)} stage(s) regressed beyond {args.tolerance}x: {', '.join(regressions)}")
+                status = 1
+    else:
+        compare(stages, {})
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2) + '\n')
+        print(f"Baseline written to {args.baseline}")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""Figure builders whose size is bounded regardless of the number of rows."""
+import io
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from swiggy.aggregates import group_codes
+
+# Above this many rows a scatter plot is reduced before it is sent to the browser.
+SCATTER_MAX_POINTS = 20_000
+SCATTER_MODES = ('density', 'sample')
+# Grid resolution of the density mode, per axis.
+DENSITY_BINS = 60
+# Share of the sample budget reserved for outliers, and the quantiles that
+# delimit them.
+OUTLIER_SHARE = 0.1
+OUTLIER_QUANTILES = (0.005, 0.995)
+# Rendered heatmaps kept in memory, keyed by matrix value.
+HEATMAP_CACHE_SIZE = 64
+# Heatmap values are rounded to this many decimals before rendering, so
+# matrices that differ only by floating-point noise share one image.
+HEATMAP_DECIMALS = 6
+
+
+def scatter(df, x, y, color, mode='density', max_points=SCATTER_MAX_POINTS, **kwargs):
+    """``px.scatter`` that switches to a reduced view above ``max_points`` rows.
+
+    ``mode='density'`` bins every row into a grid per ``color`` group and
+    draws one marker per occupied cell, sized by its row count.
+    ``mode='sample'`` draws a stratified, outlier-preserving sample; only the
+    sampled rows' ``hover_data`` is looked up and shipped.
+    """
+    if len(df) <= max_points:
+        return px.scatter(df, x=x, y=y, color=color, **kwargs)
+    title = kwargs.pop('title', None)
+    if mode == 'sample':
+        rows = stratified_sample(df, [x, y], color, max_points)
+        label = f"sample of {len(rows):,} / {len(df):,} rows"
+        return px.scatter(df.take(rows), x=x, y=y, color=color, title=f"{title} ({label})", **kwargs)
+    kwargs.pop('hover_data', None)
+    return density_scatter(df, x, y, color, title=density_title(title, len(df)), **kwargs)
+
+
+def density_title(title, rows):
+    return f"{title} (density of {rows:,} rows)"
+
+
+def bin_edges(low, high, bins=DENSITY_BINS):
+    """Edges of ``bins`` equal bins from ``low`` to ``high`` (one unit wide
+    if they coincide)."""
+    if low == high:
+        high = low + 1
+    return np.linspace(low, high, bins + 1)
+
+
+def bin_centers(edges):
+    return (edges[:-1] + edges[1:]) / 2
+
+
+def density_grid(df, x, y, color, bins=DENSITY_BINS):
+    """Row counts per (``color`` group, x bin, y bin), as a long frame.
+
+    All groups are histogrammed in one ``np.bincount`` over a combined
+    group/cell index.
+    """
+    codes, keys = group_codes(df[color])
+    xs = df[x].to_numpy(dtype='float64', na_value=np.nan)
+    ys = df[y].to_numpy(dtype='float64', na_value=np.nan)
+    keep = (codes >= 0) & ~np.isnan(xs) & ~np.isnan(ys)
+    codes, xs, ys = codes[keep], xs[keep], ys[keep]
+    if not len(codes):
+        return pd.DataFrame(columns=[color, x, y, 'count'])
+    x_edges, y_edges = bin_edges(xs.min(), xs.max(), bins), bin_edges(ys.min(), ys.max(), bins)
+    x_bin = np.clip(np.searchsorted(x_edges, xs, side='right') - 1, 0, bins - 1)
+    y_bin = np.clip(np.searchsorted(y_edges, ys, side='right') - 1, 0, bins - 1)
+    cell = (codes.astype(np.int64) * bins + x_bin) * bins + y_bin
+    counts = np.bincount(cell, minlength=len(keys) * bins * bins)
+    occupied = np.flatnonzero(counts)
+    group, rest = np.divmod(occupied, bins * bins)
+    x_index, y_index = np.divmod(rest, bins)
+    return pd.DataFrame({
+        color: np.asarray(keys)[group],
+        x: bin_centers(x_edges)[x_index],
+        y: bin_centers(y_edges)[y_index],
+        'count': counts[occupied],
+    })
+
+
+def density_scatter(df, x, y, color, bins=DENSITY_BINS, **kwargs):
+    return density_figure(density_grid(df, x, y, color, bins), x, y, color, **kwargs)
+
+
+def density_figure(grid, x, y, color, title=None, color_discrete_sequence=None, template=None):
+    """One marker per occupied cell of ``grid`` (as :func:`density_grid`
+    returns it), sized by its row count."""
+    fig = go.Figure()
+    palette = color_discrete_sequence or px.colors.qualitative.Plotly
+    largest = grid['count'].max() if len(grid) else 1
+    for i, (key, cells) in enumerate(grid.groupby(color, sort=False)):
+        fig.add_trace(go.Scatter(
+            x=cells[x], y=cells[y], mode='markers', name=str(key),
+            marker=dict(
+                color=palette[i % len(palette)],
+                size=4 + 16 * np.sqrt(cells['count'] / largest),
+                opacity=0.7,
+            ),
+            customdata=cells['count'],
+            hovertemplate=f"{x}: %{{x:.4g}}<br>{y}: %{{y:.4g}}<br>rows: %{{customdata:,}}<extra>{key}</extra>",
+        ))
+    fig.update_layout(title=title, template=template, xaxis_title=x, yaxis_title=y, legend_title_text=color)
+    return fig
+
+
+def box(summary, outliers, by, value, orientation='v', title=None, color_discrete_sequence=None,
+        template=None):
+    """Box plot drawn from precomputed per-group summaries.
+
+    ``summary`` and ``outliers`` come from :mod:`swiggy.quantiles`; the
+    figure holds a handful of numbers per group, whatever the row count.
+    """
+    fig = go.Figure()
+    palette = color_discrete_sequence or px.colors.qualitative.Plotly
+    horizontal = orientation == 'h'
+    points = outliers.groupby(by, sort=False)[value]
+    for i, (key, row) in enumerate(summary.iterrows()):
+        color = palette[i % len(palette)]
+        position = [str(key)]
+        fig.add_trace(go.Box(
+            **({'y': position} if horizontal else {'x': position}),
+            q1=[row['q1']], median=[row['median']], q3=[row['q3']],
+            lowerfence=[row['lowerfence']], upperfence=[row['upperfence']],
+            orientation=orientation, name=str(key), marker_color=color, legendgroup=str(key),
+        ))
+        if key in points.groups:
+            values = points.get_group(key).to_numpy()
+            labels = [str(key)] * len(values)
+            fig.add_trace(go.Scatter(
+                x=values if horizontal else labels, y=labels if horizontal else values,
+                mode='markers', marker=dict(color=color, size=5), name=str(key),
+                legendgroup=str(key), showlegend=False,
+            ))
+    category_axis, value_axis = ('yaxis', 'xaxis') if horizontal else ('xaxis', 'yaxis')
+    fig.update_layout(**{
+        'title': title,
+        'template': template,
+        'legend_title_text': by,
+        f'{category_axis}_title': by,
+        f'{category_axis}_type': 'category',
+        f'{value_axis}_title': value,
+    })
+    return fig
+
+
+def stratified_sample(df, columns, by, size, seed=0):
+    """Sorted row positions of a sample of about ``size`` rows.
+
+    Every ``by`` group gets a share proportional to its size (at least one
+    row), and rows beyond the :data:`OUTLIER_QUANTILES` of any of
+    ``columns`` are kept first so that extremes stay visible.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(df)
+    outliers = np.zeros(n, dtype=bool)
+    for column in columns:
+        values = df[column].to_numpy(dtype='float64', na_value=np.nan)
+        low, high = np.nanquantile(values, OUTLIER_QUANTILES)
+        outliers |= (values < low) | (values > high)
+    outlier_rows = np.flatnonzero(outliers)
+    budget = int(size * OUTLIER_SHARE)
+    if len(outlier_rows) > budget:
+        outlier_rows = rng.choice(outlier_rows, budget, replace=False)
+
+    codes, keys = group_codes(df[by])
+    codes = np.where(codes < 0, len(keys), codes)
+    sizes = np.bincount(codes, minlength=len(keys) + 1)
+    quota = np.ceil(sizes * (size - len(outlier_rows)) / n).astype(np.int64)
+    # Random order within each group; keep each group's first ``quota`` rows.
+    order = np.lexsort((rng.random(n), codes))
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    position = np.arange(n) - starts[codes[order]]
+    sampled = order[position < quota[codes[order]]]
+    return np.union1d(sampled, outlier_rows)
+
+
+def heatmap(matrix):
+    """Annotated seaborn heatmap of a square ``matrix`` (a DataFrame), as
+    PNG bytes.
+
+    The figure is drawn on a standalone :class:`matplotlib.figure.Figure`,
+    never registered with pyplot, so nothing outlives the call; the PNG is
+    memoized by the matrix's labels and values.
+    """
+    values = tuple(np.round(matrix.to_numpy(dtype='float64'), HEATMAP_DECIMALS).ravel().tolist())
+    return _heatmap(tuple(matrix.index), tuple(matrix.columns), values)
+
+
+@lru_cache(maxsize=HEATMAP_CACHE_SIZE)
+def _heatmap(index, columns, values):
+    # Imported here so that loading the charts does not pull in matplotlib.
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    matrix = pd.DataFrame(np.array(values).reshape(len(index), len(columns)), index=index, columns=columns)
+    fig = Figure(facecolor='#333333')
+    ax = fig.subplots()
+    sns.heatmap(matrix, annot=True, cmap='viridis', ax=ax)
+    ax.set_facecolor('#333333')
+    ax.tick_params(colors='#e0e0e0')
+    cbar = ax.collections[0].colorbar
+    cbar.ax.yaxis.set_tick_params(color='#e0e0e0')
+    cbar.ax.yaxis.label.set_color('#e0e0e0')
+    cbar.ax.tick_params(axis='y', colors='#e0e0e0')
+    ax.xaxis.label.set_color('#e0e0e0')
+    ax.yaxis.label.set_color('#e0e0e0')
+    ax.title.set_color('#FFD700')
+    buffer = io.BytesIO()
+    # Same output settings as st.pyplot.
+    fig.savefig(buffer, format='png', dpi=200, bbox_inches='tight', facecolor=fig.get_facecolor())
+    return buffer.getvalue()
@@ -0,0 +1,118 @@
+"""Mergeable co-moments of the metrics, for correlation matrices.
+
+:class:`CoMoments` keeps, per group, the number of complete rows, the
+mean of each metric and the matrix of centered co-moments
+``sum((x - mean_x) * (y - mean_y))``.  Groups, chunks and instances pool
+exactly (Chan et al.'s pairwise update), so a correlation matrix for any
+set of groups follows from a few small arrays instead of another pass
+over the rows.
+"""
+import numpy as np
+import pandas as pd
+
+from swiggy.aggregates import METRICS, group_codes
+
+
+class CoMoments:
+    """Per-group count, means and co-moment matrix of ``columns``.
+
+    Only rows where every column is present are counted, so correlations
+    match ``df[columns].dropna().corr()``.  ``count`` has one entry per
+    key in ``keys``, ``mean`` one row and ``m2`` one ``k x k`` matrix.
+    """
+
+    def __init__(self, columns, keys, count, mean, m2):
+        self.columns = list(columns)
+        self.keys = keys
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    @classmethod
+    def from_frame(cls, df, by=None, columns=METRICS):
+        """Co-moments of ``df``, overall (one group) or per ``by`` group."""
+        columns = [column for column in columns if column in df.columns]
+        # One contiguous array per column: bincount weights must not be strided.
+        values = [df[column].to_numpy(dtype='float64', na_value=np.nan) for column in columns]
+        if by is None:
+            codes, keys = np.zeros(len(df), dtype=np.int8), pd.RangeIndex(1)
+        else:
+            codes, keys = group_codes(df[by])
+        keep = codes >= 0
+        for column in values:
+            keep &= ~np.isnan(column)
+        if not keep.all():
+            codes = codes[keep]
+            values = [column[keep] for column in values]
+        size = len(keys)
+        if size == 1:
+            # One group: numpy's pairwise summation, no group codes needed.
+            count = np.array([float(len(codes))])
+            mean = np.array([[column.mean() if len(column) else np.nan for column in values]])
+            centered = [column - mean[0, i] for i, column in enumerate(values)]
+        else:
+            count = np.bincount(codes, minlength=size).astype('float64')
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = np.column_stack([np.bincount(codes, weights=column, minlength=size) / count
+                                        for column in values])
+            # Centering on each group's own mean keeps the sums well conditioned.
+            centered = [column - mean[codes, i] for i, column in enumerate(values)]
+        m2 = np.zeros((size, len(columns), len(columns)))
+        for i in range(len(columns)):
+            for j in range(i, len(columns)):
+                product = centered[i] * centered[j]
+                m2[:, i, j] = m2[:, j, i] = (product.sum() if size == 1 else
+                                             np.bincount(codes, weights=product, minlength=size))
+        present = count > 0
+        return cls(columns, keys[present], count[present], mean[present], m2[present])
+
+    def _pool(self, codes, size, count, mean, m2):
+        """Pool the groups of ``(count, mean, m2)`` that share a code."""
+        total = np.bincount(codes, weights=count, minlength=size)
+        pooled = np.zeros((size, len(self.columns)))
+        np.add.at(pooled, codes, count[:, None] * mean)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pooled /= total[:, None]
+        delta = mean - pooled[codes]
+        moments = np.zeros((size, len(self.columns), len(self.columns)))
+        np.add.at(moments, codes, m2 + count[:, None, None] * delta[:, :, None] * delta[:, None, :])
+        return total, pooled, moments
+
+    def merge(self, other):
+        """Fold ``other`` (same columns) into this instance."""
+        keys = self.keys.append(other.keys).unique()
+        codes = np.concatenate((keys.get_indexer(self.keys), keys.get_indexer(other.keys)))
+        self.count, self.mean, self.m2 = self._pool(
+            codes, len(keys),
+            np.concatenate((self.count, other.count)),
+            np.concatenate((self.mean, other.mean)),
+            np.concatenate((self.m2, other.m2)),
+        )
+        self.keys = keys
+        return self
+
+    def subset(self, keys):
+        """The groups in ``keys`` only."""
+        selected = self.keys.get_indexer(pd.Index(list(keys)))
+        selected = np.unique(selected[selected >= 0])
+        return CoMoments(self.columns, self.keys[selected], self.count[selected], self.mean[selected],
+                         self.m2[selected])
+
+    @property
+    def rows(self):
+        """Complete rows over all groups."""
+        return int(self.count.sum())
+
+    def correlation(self):
+        """Pearson correlation matrix of the columns over all groups, or None
+        without complete rows."""
+        if not self.rows:
+            return None
+        _, _, m2 = self._pool(np.zeros(len(self.count), dtype=np.int8), 1, self.count, self.mean, self.m2)
+        m2 = m2[0]
+        scale = np.sqrt(np.diag(m2))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            matrix = m2 / np.outer(scale, scale)
+        diagonal = np.diag_indices_from(matrix)
+        matrix[diagonal] = np.where(scale > 0, 1.0, np.nan)
+        return pd.DataFrame(np.clip(matrix, -1.0, 1.0), index=self.columns, columns=self.columns)
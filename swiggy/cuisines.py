@@ -0,0 +1,133 @@
+"""Cuisines listed in the comma-separated 'Food type' column.
+
+Only the distinct labels are tokenized, with vectorized string methods,
+never the rows one by one.  :class:`CuisineIndex` then expands them into a
+sparse row x cuisine indicator matrix in CSR form (``indptr`` /
+``indices``), from which cuisine counts, per-cuisine statistics and
+cuisine filters are answered without looking at the strings again.
+"""
+import numpy as np
+import pandas as pd
+
+from swiggy.aggregates import CUISINE_DIMENSION, METRICS, group_codes, partial_stats
+from swiggy.memo import Memo, memoized
+
+SEPARATOR = ', '
+
+
+def tokenize(labels):
+    """Split 'Food type' labels into cuisines.
+
+    Returns ``(label, cuisine, cuisines)``: aligned arrays of label
+    positions and cuisine codes, one pair per distinct cuisine of each
+    label, sorted by label then cuisine, and the cuisine names (sorted).
+    """
+    tokens = pd.Series(np.asarray(labels, dtype=object)).str.split(',').explode().str.strip()
+    tokens = tokens[tokens.notna() & (tokens != '')]
+    codes, cuisines = pd.factorize(tokens.to_numpy(dtype=object), sort=True)
+    pairs = np.unique(np.stack([tokens.index.to_numpy(np.int64), codes.astype(np.int64)]), axis=1)
+    return pairs[0], pairs[1], pd.Index(cuisines, name=CUISINE_DIMENSION)
+
+
+def canonicalize(food_type):
+    """'Food type' with each cuisine list spelled one way (sorted, without
+    repeats), so that "North Indian, Chinese" and "Chinese, North Indian"
+    are the same group.  Returns a categorical Series."""
+    if not isinstance(food_type.dtype, pd.CategoricalDtype):
+        food_type = food_type.astype('category')
+    labels = food_type.cat.categories
+    label, cuisine, cuisines = tokenize(labels)
+    spelled = pd.Series(np.asarray(cuisines, dtype=object)[cuisine]).groupby(label).agg(SEPARATOR.join)
+    canonical = np.asarray(labels, dtype=object).copy()
+    canonical[spelled.index.to_numpy()] = spelled.to_numpy()
+    label_codes, categories = pd.factorize(canonical)
+    if len(categories) == len(labels) and (categories == np.asarray(labels, dtype=object)).all():
+        return food_type
+    codes = food_type.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, label_codes[codes], -1)
+    return pd.Series(pd.Categorical.from_codes(codes, pd.Index(categories, dtype=labels.dtype)),
+                     index=food_type.index, name=food_type.name)
+
+
+class CuisineIndex:
+    """Sparse row x cuisine indicator matrix of one frame's 'Food type'.
+
+    Row ``i`` lists cuisines ``indices[indptr[i]:indptr[i + 1]]`` (codes
+    into ``cuisines``); rows without a 'Food type' list none.
+    """
+
+    def __init__(self, indptr, indices, cuisines):
+        self.indptr = indptr
+        self.indices = indices
+        self.cuisines = cuisines
+        self._memo = Memo()
+
+    @classmethod
+    def from_series(cls, food_type):
+        codes, labels = group_codes(food_type)
+        label, cuisine, cuisines = tokenize(labels)
+        # A trailing empty label serves code -1 (no 'Food type'), also when
+        # there are no labels at all.
+        label_sizes = np.append(np.bincount(label, minlength=len(labels)), 0)
+        label_starts = np.concatenate(([0], np.cumsum(label_sizes)[:-1]))
+        counts = label_sizes[codes]
+        starts = label_starts[codes]
+        dtype = np.int16 if len(cuisines) < 2 ** 15 else np.int32
+        return cls(*_gather(starts, counts, cuisine.astype(dtype)), cuisines)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    @property
+    def nbytes(self):
+        return self.indptr.nbytes + self.indices.nbytes
+
+    @property
+    def counts(self):
+        """Number of cuisines on each row."""
+        return np.diff(self.indptr)
+
+    def entry_rows(self):
+        """Row id of every stored (row, cuisine) entry."""
+        return np.repeat(np.arange(len(self)), self.counts)
+
+    def take(self, rows):
+        """The matrix restricted to ``rows`` (positions), in that order."""
+        indptr, indices = _gather(self.indptr[rows], self.counts[rows], self.indices)
+        return CuisineIndex(indptr, indices, self.cuisines)
+
+    def codes(self, cuisines):
+        selected = self.cuisines.get_indexer(pd.Index(list(cuisines), dtype=object))
+        return selected[selected >= 0]
+
+    def mask(self, cuisines):
+        """Boolean mask of the rows listing any of ``cuisines``."""
+        wanted = np.zeros(len(self.cuisines), dtype=bool)
+        wanted[self.codes(cuisines)] = True
+        hits = wanted[self.indices]
+        return np.bincount(self.entry_rows()[hits], minlength=len(self)) > 0
+
+    @memoized
+    def rows_with(self, cuisines):
+        """Sorted row ids listing any of ``cuisines`` (a tuple)."""
+        return np.flatnonzero(self.mask(cuisines))
+
+    def partial_stats(self, df):
+        """Per-cuisine partial statistics of ``df`` (aligned with the matrix),
+        as :func:`swiggy.aggregates.partial_stats` returns them; a row counts
+        once for every cuisine it lists."""
+        rows = self.entry_rows()
+        entries = {
+            metric: df[metric].to_numpy(dtype='float64', na_value=np.nan)[rows]
+            for metric in METRICS if metric in df.columns
+        }
+        entries[CUISINE_DIMENSION] = pd.Categorical.from_codes(self.indices, self.cuisines)
+        return partial_stats(pd.DataFrame(entries, copy=False), CUISINE_DIMENSION)
+
+
+def _gather(starts, counts, values):
+    """CSR ``(indptr, indices)`` whose row ``i`` is
+    ``values[starts[i]:starts[i] + counts[i]]``."""
+    indptr = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    offsets = np.arange(indptr[-1]) - np.repeat(indptr[:-1], counts)
+    return indptr, values[np.repeat(starts, counts) + offsets]
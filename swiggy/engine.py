@@ -0,0 +1,40 @@
+"""Headless entry point to the dashboard analyses.
+
+Runs the :mod:`swiggy.sections` registry on a frame without Streamlit, for
+scripts and batch jobs.  Like the rest of the package it never imports
+streamlit; matplotlib and seaborn are only loaded by the one section that
+draws with them, when it runs.
+"""
+from swiggy import aggregates, ingest, sections
+
+
+def context(df, **options):
+    """A :class:`~swiggy.sections.SectionContext` over all rows of ``df``.
+
+    ``options`` are passed through (``scatter_mode``, ``scatter_max_points``).
+    """
+    return sections.SectionContext(df, aggregates.GroupAggregates.from_frame(df), **options)
+
+
+def run(ctx, keys=None):
+    """Yield ``(section, blocks)`` for every section available in ``ctx``,
+    or for ``keys`` only, in display order."""
+    for item in sections.available(ctx):
+        if keys is None or item.key in keys:
+            yield item, item.compute(ctx)
+
+
+def cities(df):
+    """City names present in ``df``, sorted."""
+    return sorted(df['City'].dropna().unique())
+
+
+def city_frame(df, city):
+    """The rows of one city, with unused categories dropped."""
+    return ingest.drop_unused_categories(df[df['City'] == city])
+
+
+def analyze(source, keys=None, **options):
+    """Load ``source`` and return ``[(section, blocks), ...]`` for all of it."""
+    df, _ = ingest.load_csv(source)
+    return list(run(context(df, **options), keys))
@@ -0,0 +1,237 @@
+"""Row selection for the sidebar filters."""
+import math
+import numpy as np
+import pandas as pd
+
+from swiggy.aggregates import group_codes
+from swiggy.cuisines import CuisineIndex
+from swiggy.memo import Memo, memoized
+from swiggy.ranking import Ranking
+
+
+def mask(df, cities, rating_range, price_range, cuisines=()):
+    """Boolean mask of the rows matching the sidebar selection; an empty
+    ``cuisines`` selection does not restrict."""
+    selected = (
+        df['City'].isin(cities) &
+        (df['Avg ratings'] >= rating_range[0]) &
+        (df['Avg ratings'] <= rating_range[1]) &
+        (df['Price'] >= price_range[0]) &
+        (df['Price'] <= price_range[1])
+    )
+    if cuisines:
+        selected &= CuisineIndex.from_series(df['Food type']).mask(cuisines)
+    return selected
+
+
+class _SortedColumn:
+    """Row ids of one numeric column ordered by value, for range lookups."""
+
+    def __init__(self, series, row_dtype):
+        values = series.to_numpy()
+        if values.dtype.kind not in 'iuf':
+            values = series.to_numpy(dtype='float64', na_value=np.nan)
+        self.order = np.argsort(values, kind='stable').astype(row_dtype)
+        self.values = values[self.order]
+        # NaNs sort last and never match a range, as with a boolean mask.
+        self.valid = int(np.count_nonzero(~pd.isna(self.values)))
+        self.column = values
+
+    def bound(self, value):
+        # Compare in the column's own precision, like ``series >= value``.
+        return self.values.dtype.type(value) if self.values.dtype.kind == 'f' else value
+
+    def bounds(self):
+        """(min, max) of the non-missing values, or None if there are none."""
+        if not self.valid:
+            return None
+        return self.values[0], self.values[self.valid - 1]
+
+    def search(self, value, side='left'):
+        """``np.searchsorted`` over the non-missing values.
+
+        Integer columns are searched with an integer of their own dtype
+        (an integer column holds nothing strictly between ``floor(value)``
+        and ``ceil(value)``), since a Python int or float would make numpy
+        upcast the whole column first.
+        """
+        values = self.values[:self.valid]
+        if values.dtype.kind not in 'iu' or not math.isfinite(value):
+            return int(np.searchsorted(values, self.bound(value), side=side))
+        value = math.ceil(value) if side == 'left' else math.floor(value)
+        info = np.iinfo(values.dtype)
+        if value < info.min:
+            return 0
+        if value > info.max:
+            return len(values)
+        return int(np.searchsorted(values, values.dtype.type(value), side=side))
+
+    def range(self, low, high):
+        """Row ids with ``low <= value <= high``, in value order."""
+        start = self.search(low, side='left')
+        stop = self.search(high, side='right')
+        return self.order[start:max(start, stop)]
+
+    def within(self, rows, low, high):
+        values = self.column[rows]
+        return (values >= self.bound(low)) & (values <= self.bound(high))
+
+
+class FilterIndex:
+    """Answers sidebar filter states from per-dataset sorted indices.
+
+    Built once per dataset: row ids grouped by city and row ids sorted by
+    'Avg ratings' and by 'Price', so each predicate is a lookup or a binary
+    search.  A selection starts from the smallest of the three candidate
+    sets and checks the other predicates on those rows only, never
+    materializing a full-table boolean mask.  Candidate sets and results
+    are memoized per index (:mod:`swiggy.memo`), so changing one control
+    reuses the other two and the memos are freed with the index.  The
+    optional cuisine filter is answered from the dataset's
+    :class:`~swiggy.cuisines.CuisineIndex` (``cuisines``, None without a
+    'Food type' column).  The sorted columns also serve the ranking
+    sections through :meth:`ranking`.
+    """
+
+    def __init__(self, df):
+        self.size = len(df)
+        row_dtype = np.int32 if self.size < 2 ** 31 else np.int64
+        codes, self.cities = group_codes(df['City'])
+        self.city_codes = codes
+        # Stable counting sort: rows of each city stay in file order.
+        self.city_order = np.argsort(codes, kind='stable').astype(row_dtype)
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.cities))
+        missing = int(np.count_nonzero(codes < 0))
+        self.city_bounds = missing + np.concatenate(([0], np.cumsum(counts)))
+        self.rating = _SortedColumn(df['Avg ratings'], row_dtype)
+        self.price = _SortedColumn(df['Price'], row_dtype)
+        self.cuisines = CuisineIndex.from_series(df['Food type']) if 'Food type' in df.columns else None
+        self._memo = Memo()
+
+    def cache_clear(self):
+        """Forget every memoized answer, here and in the cuisine index."""
+        self._memo.clear()
+        if self.cuisines is not None:
+            self.cuisines._memo.clear()
+
+    def _city_codes(self, cities):
+        selected = self.cities.get_indexer(pd.Index(list(cities), dtype=object))
+        selected = selected[selected >= 0]
+        if any(pd.isna(city) for city in cities):
+            selected = np.append(selected, -1)
+        return np.unique(selected)
+
+    @memoized
+    def city_rows(self, cities):
+        """Row ids in any of ``cities`` (a tuple), in file order."""
+        parts = []
+        for code in self._city_codes(cities):
+            if code < 0:
+                parts.append(self.city_order[:self.city_bounds[0]])
+            else:
+                parts.append(self.city_order[self.city_bounds[code]:self.city_bounds[code + 1]])
+        rows = np.concatenate(parts) if parts else self.city_order[:0]
+        return np.sort(rows) if len(parts) > 1 else rows
+
+    @memoized
+    def rating_rows(self, rating_range):
+        return self.rating.range(*rating_range)
+
+    @memoized
+    def price_rows(self, price_range):
+        return self.price.range(*price_range)
+
+    @memoized
+    def select(self, cities, rating_range, price_range, cuisines=()):
+        """Sorted row ids matching the filter state; same rows as :func:`mask`."""
+        rows = self._select(cities, rating_range, price_range)
+        if cuisines:
+            rows = np.intersect1d(rows, self.cuisines.rows_with(tuple(cuisines)), assume_unique=True)
+        return rows
+
+    @memoized
+    def cuisine_view(self, cities, rating_range, price_range, cuisines=()):
+        """The cuisine matrix restricted to the rows of :meth:`select`."""
+        return self.cuisines.take(self.select(cities, rating_range, price_range, cuisines))
+
+    @memoized
+    def ranking(self, cities, rating_range, price_range, cuisines=()):
+        """Top-N and threshold queries over the rows of :meth:`select`,
+        answered from the sorted 'Avg ratings' and 'Price' columns."""
+        return Ranking(self, self.select(cities, rating_range, price_range, cuisines))
+
+    def city_only(self, rating_range, price_range, cuisines=()):
+        """Whether a filter state restricts by city alone, i.e. keeps every
+        row of its cities that has a rating and a price."""
+        return (not cuisines and len(self.rating_rows(rating_range)) == self.rating.valid
+                and len(self.price_rows(price_range)) == self.price.valid)
+
+    def _select(self, cities, rating_range, price_range):
+        city_count = sum(
+            self.city_bounds[0] if code < 0 else self.city_bounds[code + 1] - self.city_bounds[code]
+            for code in self._city_codes(cities)
+        )
+        candidates = sorted([
+            (city_count, 'city'),
+            (len(self.rating_rows(rating_range)), 'rating'),
+            (len(self.price_rows(price_range)), 'price'),
+        ])
+        count, smallest = candidates[0]
+        if count == self.size:
+            # Every predicate is unrestricted (the default sidebar state).
+            return np.arange(self.size, dtype=self.city_order.dtype)
+        if count > self.size // 16:
+            # Large selections: AND per-control bitmaps (each memoized) and
+            # read the row ids back in file order, all in linear time.
+            selected = self.city_bitmap(cities) & self.rating_bitmap(rating_range)
+            selected &= self.price_bitmap(price_range)
+            return np.flatnonzero(selected)
+        # Small selections: check the other predicates on the candidates only.
+        if smallest == 'city':
+            rows = self.city_rows(cities)
+        elif smallest == 'rating':
+            rows = self.rating_rows(rating_range)
+        else:
+            rows = self.price_rows(price_range)
+        if len(rows) == 0:
+            return rows
+        keep = np.ones(len(rows), dtype=bool)
+        if smallest != 'city':
+            keep &= self._city_lookup(cities)[self.city_codes[rows]]
+        if smallest != 'rating':
+            keep &= self.rating.within(rows, *rating_range)
+        if smallest != 'price':
+            keep &= self.price.within(rows, *price_range)
+        rows = rows[keep] if not keep.all() else rows
+        return rows if smallest == 'city' else np.sort(rows)
+
+    def _city_lookup(self, cities):
+        # Indexed by city code; code -1 (missing city) maps to the last slot.
+        lookup = np.zeros(len(self.cities) + 1, dtype=bool)
+        lookup[self._city_codes(cities)] = True
+        return lookup
+
+    def _scatter(self, rows):
+        bitmap = np.zeros(self.size, dtype=bool)
+        bitmap[rows] = True
+        return bitmap
+
+    @memoized
+    def city_bitmap(self, cities):
+        return self._city_lookup(cities)[self.city_codes]
+
+    @memoized
+    def rating_bitmap(self, rating_range):
+        return self._scatter(self.rating_rows(rating_range))
+
+    @memoized
+    def price_bitmap(self, price_range):
+        return self._scatter(self.price_rows(price_range))
+
+
+def view(df, rows):
+    """The rows of ``df`` at positions ``rows`` (the frame itself if None or
+    all).  A copy: read only the columns you need before calling this."""
+    if rows is None or len(rows) == len(df):
+        return df
+    return df.take(rows)
@@ -0,0 +1,153 @@
+"""Parse uploaded Swiggy CSVs once, with an explicit compact schema."""
+import hashlib
+import sys
+from dataclasses import dataclass
+
+import pandas as pd
+
+from swiggy import cuisines, instrument
+
+# Low-cardinality text columns are stored as categoricals.
+CATEGORICAL_COLUMNS = ['City', 'Food type', 'Area']
+# Numeric columns are parsed as float32 and then shrunk to the smallest type
+# that holds every value (e.g. an all-integer 'Delivery time' becomes uint8).
+NUMERIC_COLUMNS = ['Price', 'Avg ratings', 'Delivery time']
+
+_HASH_BLOCK = 8 * 1024 * 1024
+# Rows per chunk in streaming mode; bounds peak memory regardless of file size.
+CHUNK_ROWS = 250_000
+
+
+@dataclass(frozen=True)
+class IngestReport:
+    rows: int
+    nbytes: int
+    default_nbytes: int
+
+    @property
+    def saved_nbytes(self):
+        return max(self.default_nbytes - self.nbytes, 0)
+
+    @property
+    def saved_ratio(self):
+        return self.saved_nbytes / self.default_nbytes if self.default_nbytes else 0.0
+
+
+@instrument.traced('fingerprint')
+def fingerprint(source):
+    """Return a content hash of an uploaded file without copying it."""
+    digest = hashlib.blake2b(digest_size=16)
+    if hasattr(source, 'getbuffer'):
+        view = source.getbuffer()
+        for start in range(0, len(view), _HASH_BLOCK):
+            digest.update(view[start:start + _HASH_BLOCK])
+        view.release()
+    else:
+        position = source.tell()
+        source.seek(0)
+        for block in iter(lambda: source.read(_HASH_BLOCK), b''):
+            digest.update(block)
+        source.seek(position)
+    return digest.hexdigest()
+
+
+def csv_dtypes():
+    """dtype mapping passed to ``pd.read_csv``; absent columns are ignored."""
+    dtypes = {column: 'category' for column in CATEGORICAL_COLUMNS}
+    dtypes.update({column: 'float32' for column in NUMERIC_COLUMNS})
+    return dtypes
+
+
+def downcast(series):
+    """Shrink a numeric column to the smallest dtype that holds its values."""
+    series = pd.to_numeric(series, errors='coerce')
+    values = series.dropna()
+    if len(values) == len(series) and (values % 1 == 0).all():
+        kind = 'unsigned' if (values >= 0).all() else 'integer'
+        return pd.to_numeric(series.astype('int64'), downcast=kind)
+    return pd.to_numeric(series, downcast='float')
+
+
+def apply_schema(df):
+    """Coerce an already-parsed frame to the compact schema, in place."""
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+    if 'Food type' in df.columns:
+        # Permutations of a cuisine list become one category.
+        df['Food type'] = cuisines.canonicalize(df['Food type'])
+    for column in NUMERIC_COLUMNS:
+        if column in df.columns:
+            df[column] = downcast(df[column])
+    return df
+
+
+def drop_unused_categories(df):
+    """Drop categories a filtered frame no longer uses, so that
+    ``value_counts`` and friends do not report zero-count groups."""
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns and isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].cat.remove_unused_categories()
+    return df
+
+
+def read_csv(source, **kwargs):
+    """``pd.read_csv`` with the compact schema applied.
+
+    Numeric columns containing text (e.g. '--' ratings) cannot be parsed
+    straight into float32; such files are re-read untyped and coerced.
+    """
+    with instrument.span('read_csv') as record:
+        try:
+            df = pd.read_csv(source, dtype=csv_dtypes(), **kwargs)
+        except (ValueError, TypeError):
+            if hasattr(source, 'seek'):
+                source.seek(0)
+            dtypes = {column: 'category' for column in CATEGORICAL_COLUMNS}
+            df = pd.read_csv(source, dtype=dtypes, **kwargs)
+        if record is not None:
+            record['rows'] = len(df)
+    with instrument.span('apply_schema'):
+        return apply_schema(df)
+
+
+def iter_csv(source, chunksize=CHUNK_ROWS):
+    """Yield ``source`` as schema-typed chunks of at most ``chunksize`` rows."""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    dtypes = {column: 'category' for column in CATEGORICAL_COLUMNS}
+    with pd.read_csv(source, dtype=dtypes, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield apply_schema(chunk)
+
+
+def default_nbytes(df):
+    """Estimate the memory ``df`` would take with pandas' default dtypes.
+
+    Computed from category counts rather than by materializing the object
+    columns, so it is cheap even on multi-GB frames.
+    """
+    total = df.index.memory_usage()
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            counts = series.value_counts(sort=False)
+            sizes = pd.Series([sys.getsizeof(str(c)) for c in counts.index], index=counts.index)
+            total += 8 * len(series) + int((counts * sizes).sum())
+        elif pd.api.types.is_numeric_dtype(series.dtype):
+            total += 8 * len(series)
+        else:
+            total += int(series.memory_usage(index=False, deep=True))
+    return total
+
+
+def load_csv(source):
+    """Parse ``source`` and report how much memory the schema saved."""
+    df = read_csv(source)
+    with instrument.span('memory_usage'):
+        report = IngestReport(
+            rows=len(df),
+            nbytes=int(df.memory_usage(index=True, deep=True).sum()),
+            default_nbytes=int(default_nbytes(df)),
+        )
+    return df, report
@@ -0,0 +1,166 @@
+"""Lightweight timing of the dashboard's hot paths.
+
+A :class:`Recorder` collects one record per :func:`span`: wall time, CPU
+time of the calling thread, change in resident memory and any fields the
+caller adds (rows, payload bytes, ...).  Spans nest, so a cached step
+that actually ran shows its inner steps below it.  Without an active
+recorder :func:`span` does nothing, and with one it costs a few clock
+reads and one small read of ``/proc``, so it can stay on in production.
+
+Records export as JSON lines, one object per span.
+"""
+import contextvars
+import functools
+import json
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+_active = contextvars.ContextVar('swiggy_recorder', default=None)
+
+try:
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+try:
+    import resource
+except ImportError:  # not on Windows
+    resource = None
+
+
+def rss_bytes():
+    """Resident memory of the process (peak resident memory where
+    ``/proc`` is not available, 0 where neither is, e.g. on Windows)."""
+    try:
+        with open('/proc/self/statm', 'rb') as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        if resource is None:
+            return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def payload_size(blocks):
+    """Bytes a section's :class:`~swiggy.sections.Block` list sends to the
+    browser, serialized the way the app sends it."""
+    size = 0
+    for kind, value in blocks:
+        if kind == 'plotly':
+            size += len(value.to_json())
+        elif kind == 'dataframe':
+            size += len(value.to_json(orient='split'))
+        elif kind == 'image':
+            size += len(value)
+        else:
+            size += len(value.encode())
+    return size
+
+
+class Recorder:
+    """Spans of one script run (``run``) of one session (``session``)."""
+
+    def __init__(self, session=None):
+        self.session = session or uuid.uuid4().hex[:12]
+        self.run = uuid.uuid4().hex[:12]
+        self.records = []
+        self.flushed = 0
+        self.finished = False
+        self._stack = []
+        self._opened = (time.time(), time.perf_counter(), time.thread_time(), rss_bytes())
+
+    def _measure(self, record, wall, cpu, rss):
+        record['wall_ms'] = round((time.perf_counter() - wall) * 1e3, 3)
+        record['cpu_ms'] = round((time.thread_time() - cpu) * 1e3, 3)
+        record['rss_delta_mb'] = round((rss_bytes() - rss) / 2 ** 20, 3)
+
+    @contextmanager
+    def span(self, name, **fields):
+        """Measure the ``with`` block; yields the record, to which the
+        block may add fields."""
+        record = {
+            'session': self.session, 'run': self.run, 'name': name,
+            'parent': self._stack[-1]['name'] if self._stack else None, 'depth': len(self._stack),
+            'start': time.time(), **fields,
+        }
+        self.records.append(record)
+        self._stack.append(record)
+        rss = rss_bytes()
+        cpu = time.thread_time()
+        wall = time.perf_counter()
+        try:
+            yield record
+        except BaseException as exc:
+            record['error'] = type(exc).__name__
+            raise
+        finally:
+            self._measure(record, wall, cpu, rss)
+            self._stack.pop()
+
+    def finish(self, name='run', **fields):
+        """Record everything since the recorder was created as one more
+        top-level span."""
+        start, wall, cpu, rss = self._opened
+        record = {'session': self.session, 'run': self.run, 'name': name, 'parent': None, 'depth': 0,
+                  'start': start, **fields}
+        self._measure(record, wall, cpu, rss)
+        self.records.append(record)
+        self.finished = True
+        return record
+
+    def frame(self, records=None):
+        """The records as a table, names indented by nesting depth."""
+        table = pd.DataFrame(self.records if records is None else records, columns=[
+            'name', 'wall_ms', 'cpu_ms', 'rss_delta_mb', 'payload_kb', 'rows', 'depth', 'error'
+        ])
+        table['name'] = ['  ' * depth + name for name, depth in zip(table['name'], table['depth'])]
+        return table.drop(columns='depth').dropna(axis=1, how='all')
+
+    def to_jsonl(self, records=None):
+        return ''.join(json.dumps(record, default=str) + '\n' for record in
+                       (self.records if records is None else records))
+
+    def flush(self, path):
+        """Append the records not yet written to the JSON-lines file ``path``."""
+        pending = []
+        for record in self.records[self.flushed:]:
+            if 'wall_ms' not in record:
+                break  # an enclosing span is still open
+            pending.append(record)
+        if pending:
+            with open(path, 'a', encoding='utf-8') as log:
+                log.write(self.to_jsonl(pending))
+            self.flushed += len(pending)
+
+
+def activate(recorder):
+    """Make ``recorder`` receive the spans of this thread (None to stop)."""
+    _active.set(recorder)
+
+
+@contextmanager
+def span(name, **fields):
+    """:meth:`Recorder.span` on the active recorder; yields None and
+    measures nothing when there is none."""
+    recorder = _active.get()
+    if recorder is None:
+        yield None
+        return
+    with recorder.span(name, **fields) as record:
+        yield record
+
+
+def traced(name):
+    """Decorator running every call of the function in a :func:`span`."""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
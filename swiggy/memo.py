@@ -0,0 +1,72 @@
+"""Bounded per-instance memoization for the per-dataset indices.
+
+``functools.lru_cache`` on a method lives on the class: every instance
+shares one cache, and each entry holds a strong reference to ``self``, so
+an index evicted from the app's resource cache would stay alive (with its
+memoized row sets) until its entries age out.  :func:`memoized` stores
+results in a :class:`Memo` owned by the instance instead, so they are
+freed together with it.
+"""
+import functools
+import threading
+from collections import OrderedDict
+
+# Bytes of memoized results one index keeps; the most recent result is
+# always kept, however large.
+MAX_BYTES = 256 * 2 ** 20
+MAX_ENTRIES = 64
+
+
+def nbytes(value):
+    """Memory held by a memoized result (its ``nbytes``; 0 if it has none)."""
+    return int(getattr(value, 'nbytes', 0))
+
+
+class Memo:
+    """Least-recently-used results, bounded by count and by bytes."""
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, compute):
+        """The result stored under ``key``, computing and storing it with
+        ``compute()`` if there is none."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+        # Computed outside the lock: sessions share indices, and a slow
+        # selection must not block lookups of other keys.
+        value = compute()
+        size = nbytes(value)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (value, size)
+                self.nbytes += size
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries
+                                              or self.nbytes > self.max_bytes):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+
+def memoized(method):
+    """Memoize ``method`` by its arguments in the instance's ``_memo``
+    (a :class:`Memo` created in ``__init__``)."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        return self._memo.get(key, lambda: method(self, *args, **kwargs))
+    return wrapper
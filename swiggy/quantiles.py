@@ -0,0 +1,227 @@
+"""Per-group box-plot summaries computed on the server.
+
+:func:`box_summary` is exact and vectorized across groups.  :class:`BoxSketch`
+is its mergeable counterpart for chunked data: a log-bucketed histogram
+(relative accuracy ``alpha``) plus the most extreme values of each group.
+
+Both return a summary frame with one row per group (``count``, ``min``,
+``q1``, ``median``, ``q3``, ``max``, ``lowerfence``, ``upperfence``) and a
+long frame of at most ``max_outliers`` outliers per group.
+"""
+import numpy as np
+import pandas as pd
+
+from swiggy.aggregates import group_codes
+
+# Outliers shipped per group; the most extreme ones are kept.
+MAX_OUTLIERS = 50
+SUMMARY_COLUMNS = ['count', 'min', 'q1', 'median', 'q3', 'max', 'lowerfence', 'upperfence']
+
+
+def _fences(q1, q3, low, high):
+    """Tukey fences, clamped to the observed range."""
+    iqr = q3 - q1
+    return np.maximum(q1 - 1.5 * iqr, low), np.minimum(q3 + 1.5 * iqr, high)
+
+
+def box_summary(df, by, value, max_outliers=MAX_OUTLIERS):
+    """Exact quartiles, whiskers and capped outliers of ``value`` per ``by``."""
+    codes, keys = group_codes(df[by])
+    values = df[value].to_numpy(dtype='float64', na_value=np.nan)
+    keep = (codes >= 0) & ~np.isnan(values)
+    codes, values = codes[keep], values[keep]
+    if not len(values):
+        return pd.DataFrame(columns=SUMMARY_COLUMNS), pd.DataFrame(columns=[by, value])
+
+    # One sort orders every group's values; groups are contiguous runs.
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    counts = np.bincount(codes, minlength=len(keys))
+    present = np.flatnonzero(counts)
+    counts = counts[present]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    def quantile(p):
+        position = starts + p * (counts - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, starts + counts - 1)
+        return values[lower] + (position - lower) * (values[upper] - values[lower])
+
+    q1, median, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+    low, high = values[starts], values[starts + counts - 1]
+    lower_fence, upper_fence = _fences(q1, q3, low, high)
+
+    # Whiskers end at the most extreme values inside the fences.
+    group = np.repeat(np.arange(len(present)), counts)
+    inside = (values >= lower_fence[group]) & (values <= upper_fence[group])
+    summary = pd.DataFrame({
+        'count': counts,
+        'min': low,
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'max': high,
+        'lowerfence': np.fmin.reduceat(np.where(inside, values, np.nan), starts),
+        'upperfence': np.fmax.reduceat(np.where(inside, values, np.nan), starts),
+    }, index=pd.Index(np.asarray(keys)[present], name=by))
+
+    # Outliers sit at both ends of each run; keep the most extreme of each end.
+    rank_low = np.arange(len(values)) - starts[group]
+    rank_high = starts[group] + counts[group] - 1 - np.arange(len(values))
+    per_end = max(max_outliers // 2, 1)
+    shipped = ~inside & (np.minimum(rank_low, rank_high) < per_end)
+    outliers = pd.DataFrame({by: np.asarray(keys)[present][group[shipped]], value: values[shipped]})
+    return summary, outliers
+
+
+class BoxSketch:
+    """Mergeable per-group quantile sketch.
+
+    Values are counted in logarithmic buckets, so every order statistic is
+    known within a relative error ``alpha``.  Quantiles interpolate
+    linearly between adjacent order statistics, as :func:`box_summary`
+    does, and so stay within ``alpha`` of the exact ones for values of one
+    sign.  Each group's ``max_outliers / 2`` smallest and largest values
+    are kept exactly: min/max, order statistics among them and the shipped
+    outliers are exact, and a group of at most ``max_outliers`` values is
+    summarized exactly.
+    """
+
+    def __init__(self, alpha=0.01, max_outliers=MAX_OUTLIERS):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.max_outliers = max_outliers
+        # Bucket 0 holds zero; +/-(k + offset) hold magnitudes around gamma**k.
+        self.offset = int(np.ceil(-np.log(1e-9) / np.log(self.gamma))) + 1
+        self.buckets = None
+        self.extremes = None
+
+    def _bucket(self, values):
+        magnitude = np.abs(values)
+        nonzero = magnitude > 1e-9
+        index = np.zeros(len(values), dtype=np.int64)
+        index[nonzero] = np.ceil(np.log(magnitude[nonzero]) / np.log(self.gamma)).astype(np.int64) + self.offset
+        return np.where(values < 0, -index, index)
+
+    def _bucket_value(self, index):
+        magnitude = 2 * self.gamma ** (np.abs(index) - self.offset) / (self.gamma + 1)
+        return np.where(index == 0, 0.0, np.sign(index) * magnitude)
+
+    def _trim(self, *frames):
+        frames = [frame for frame in frames if frame is not None]
+        if not frames:
+            return None
+        extremes = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        per_end = max(self.max_outliers // 2, 1)
+        ranked = extremes.groupby('group', sort=False)['value']
+        keep = (ranked.rank(method='first') <= per_end) | \
+               (ranked.rank(method='first', ascending=False) <= per_end)
+        return extremes[keep].reset_index(drop=True)
+
+    def update(self, groups, values):
+        """Add one chunk: ``groups`` and ``values`` are aligned Series."""
+        codes, keys = group_codes(groups)
+        values = values.to_numpy(dtype='float64', na_value=np.nan)
+        keep = (codes >= 0) & ~np.isnan(values)
+        codes, values = codes[keep], values[keep]
+        if not len(values):
+            return self
+        order = np.lexsort((values, codes))
+        codes, values = codes[order], values[order]
+        labels = np.asarray(keys, dtype=object)
+
+        buckets = self._bucket(values)
+        low = buckets.min()
+        cells, counts = np.unique(codes.astype(np.int64) * (buckets.max() - low + 1) + (buckets - low),
+                                  return_counts=True)
+        cell_codes, cell_buckets = np.divmod(cells, buckets.max() - low + 1)
+        counts = pd.Series(counts.astype('float64'),
+                           index=pd.MultiIndex.from_arrays([labels[cell_codes], cell_buckets + low]))
+        self.buckets = counts if self.buckets is None else self.buckets.add(counts, fill_value=0)
+
+        # Values are sorted within each group: the extremes are run ends.
+        sizes = np.bincount(codes, minlength=len(keys))
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))[codes]
+        rank = np.arange(len(values)) - starts
+        per_end = max(self.max_outliers // 2, 1)
+        ends = (rank < per_end) | (rank >= sizes[codes] - per_end)
+        chunk = pd.DataFrame({'group': labels[codes[ends]], 'value': values[ends]})
+        self.extremes = self._trim(self.extremes, chunk)
+        return self
+
+    def merge(self, other):
+        if other.buckets is not None:
+            self.buckets = other.buckets if self.buckets is None else self.buckets.add(other.buckets, fill_value=0)
+        self.extremes = self._trim(self.extremes, other.extremes)
+        return self
+
+    def summary(self, by='group', value='value'):
+        """Box summary and capped outliers, as returned by :func:`box_summary`."""
+        if self.buckets is None:
+            return pd.DataFrame(columns=SUMMARY_COLUMNS), pd.DataFrame(columns=[by, value])
+        buckets = self.buckets.sort_index()
+        labels = buckets.index.get_level_values(0)
+        index = buckets.index.get_level_values(1).to_numpy()
+        counts = buckets.to_numpy()
+        groups, group = np.unique(labels.to_numpy(dtype=object), return_inverse=True)
+        totals = np.bincount(group, weights=counts).astype(np.int64)
+        cumulative = np.cumsum(counts)
+        before = np.concatenate(([0], np.cumsum(totals)[:-1]))
+
+        # The kept extremes, sorted within each group: the ``per_end``
+        # smallest values first, then the ``per_end`` largest (or, for a
+        # group of at most ``max_outliers`` values, all of them).
+        frame = self.extremes.assign(position=pd.Index(groups).get_indexer(self.extremes['group']))
+        frame = frame.sort_values(['position', 'value'], kind='stable', ignore_index=True)
+        stored = frame['value'].to_numpy(dtype='float64')
+        position = frame['position'].to_numpy()
+        kept = np.bincount(position, minlength=len(groups))
+        first = np.concatenate(([0], np.cumsum(kept)[:-1]))
+        complete = kept == totals
+        per_end = max(self.max_outliers // 2, 1)
+        low, high = stored[first], stored[first + kept - 1]
+
+        def order_statistic(rank):
+            # The ``rank``-th smallest value of each group (0-based): exact if
+            # it is a kept extreme, else the value of its bucket.
+            bucket = np.searchsorted(cumulative, before + rank + 1 - 0.5)
+            result = self._bucket_value(index[np.minimum(bucket, len(index) - 1)])
+            from_low = complete | (rank < per_end)
+            from_high = ~from_low & (totals - 1 - rank < per_end)
+            result[from_low] = stored[(first + np.minimum(rank, kept - 1))[from_low]]
+            result[from_high] = stored[(first + kept - (totals - rank))[from_high]]
+            return result
+
+        def quantile(p):
+            # Linear interpolation between adjacent ranks, like the exact path.
+            rank = p * (totals - 1)
+            lower = np.floor(rank).astype(np.int64)
+            upper = np.minimum(lower + 1, totals - 1)
+            below, above = order_statistic(lower), order_statistic(upper)
+            return np.clip(below + (rank - lower) * (above - below), low, high)
+
+        q1, median, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+        lower_fence, upper_fence = _fences(q1, q3, low, high)
+        outside = (stored < lower_fence[position]) | (stored > upper_fence[position])
+        # Whiskers end at the most extreme kept value inside the fences, which
+        # is exact when one of the kept values at that end is inside; if
+        # every kept value at that end is an outlier, at the fence.
+        rank = np.arange(len(stored)) - first[position]
+        lower_end = (complete[position] | (rank < per_end)) & ~outside
+        upper_end = (complete[position] | (rank >= kept[position] - per_end)) & ~outside
+        lower_whisker = np.full(len(groups), np.inf)
+        upper_whisker = np.full(len(groups), -np.inf)
+        np.minimum.at(lower_whisker, position[lower_end], stored[lower_end])
+        np.maximum.at(upper_whisker, position[upper_end], stored[upper_end])
+        summary = pd.DataFrame({
+            'count': totals,
+            'min': low,
+            'q1': q1,
+            'median': median,
+            'q3': q3,
+            'max': high,
+            'lowerfence': np.where(np.isfinite(lower_whisker), lower_whisker, lower_fence),
+            'upperfence': np.where(np.isfinite(upper_whisker), upper_whisker, upper_fence),
+        }, index=pd.Index(groups, name=by))
+        outliers = frame.loc[outside, ['group', 'value']].rename(columns={'group': by, 'value': value})
+        return summary, outliers.reset_index(drop=True)
@@ -0,0 +1,157 @@
+"""Top-N and threshold queries without sorting the filtered rows.
+
+:func:`top_k` selects the best ``k`` values of an array in linear time
+(``np.partition``) and only sorts those.  :class:`Ranking` goes further
+for the columns the :class:`~swiggy.filters.FilterIndex` keeps sorted
+('Avg ratings' and 'Price'): a threshold is a binary search into the
+per-dataset sorted permutation, and a top-N walks that permutation from
+the best end until enough selected rows have been seen, so neither
+depends on how many rows the sidebar filters keep.
+"""
+import operator
+
+import numpy as np
+
+# Comparisons that select a contiguous stretch of a sorted column.
+RANGE_OPERATORS = {
+    '==': operator.eq, '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+# Rows examined by the first step of a top-N walk, at least.
+MIN_WALK = 1024
+
+
+def _keys(values, ascending):
+    keys = np.asarray(values, dtype='float64')
+    return keys if ascending else -keys
+
+
+def top_k(values, k, ascending=True):
+    """Positions of the ``k`` smallest (largest if not ``ascending``)
+    values, best first.  Ties keep position order and NaNs come last, as
+    with a stable ``sort_values().head(k)``."""
+    keys = _keys(values, ascending)
+    valid = ~np.isnan(keys)
+    count = int(np.count_nonzero(valid))
+    if k < count:
+        boundary = np.partition(keys[valid], k - 1)[k - 1]
+        candidates = np.flatnonzero(keys <= boundary)
+    else:
+        candidates = np.flatnonzero(valid)
+    best = candidates[np.lexsort((candidates, keys[candidates]))][:k]
+    if len(best) < k:
+        best = np.concatenate((best, np.flatnonzero(~valid)[:k - len(best)]))
+    return best
+
+
+class Ranking:
+    """Threshold and top-N queries over the rows ``rows`` (sorted row ids,
+    as :meth:`~swiggy.filters.FilterIndex.select` returns them) of the
+    dataset indexed by ``index``.
+
+    Results are positions into the selection, i.e. into the filtered
+    frame ``filters.view(df, rows)``.
+    """
+
+    def __init__(self, index, rows):
+        self.rows = rows
+        self.size = index.size
+        self.columns = {'Avg ratings': index.rating, 'Price': index.price}
+
+    @property
+    def nbytes(self):
+        return self.rows.nbytes
+
+    def supports(self, where=(), order_by=None):
+        """Whether :meth:`select` can answer the query from sorted columns."""
+        return (all(column in self.columns and op in RANGE_OPERATORS for column, op, _ in where)
+                and (order_by is None or order_by in self.columns))
+
+    def _positions(self, ids):
+        """Positions in the selection of the row ids ``ids``; -1 for rows
+        outside it."""
+        if len(self.rows) == self.size:
+            return ids
+        if len(self.rows) == 0:
+            return np.full(len(ids), -1)
+        positions = np.minimum(np.searchsorted(self.rows, ids), len(self.rows) - 1)
+        return np.where(self.rows[positions] == ids, positions, -1)
+
+    def _range(self, column, where):
+        """(start, stop) of the stretch of ``column``'s sorted values that
+        satisfies every clause of ``where`` on it."""
+        sorted_column = self.columns[column]
+        start, stop = 0, sorted_column.valid
+        for name, op, value in where:
+            if name != column:
+                continue
+            if op in ('>', '>=', '=='):
+                start = max(start, sorted_column.search(value, side='right' if op == '>' else 'left'))
+            if op in ('<', '<=', '=='):
+                stop = min(stop, sorted_column.search(value, side='left' if op == '<' else 'right'))
+        return start, max(start, stop)
+
+    def _matches(self, ids, where, skip):
+        """Mask of ``ids`` passing the clauses of ``where`` not on ``skip``."""
+        keep = np.ones(len(ids), dtype=bool)
+        for column, op, value in where:
+            if column != skip:
+                sorted_column = self.columns[column]
+                keep &= RANGE_OPERATORS[op](sorted_column.column[ids], sorted_column.bound(value))
+        return keep
+
+    def _hits(self, ids, where, skip):
+        """(ids, positions) of the rows of ``ids`` that are selected and
+        pass ``where``."""
+        positions = self._positions(ids)
+        keep = (positions >= 0) & self._matches(ids, where, skip)
+        return ids[keep], positions[keep]
+
+    def select(self, where=(), order_by=None, ascending=True, limit=None):
+        """Positions of the selected rows matching every ``(column,
+        operator, value)`` of ``where``, in ``order_by`` order (ties and
+        unordered results in row order, missing values last) and cut to
+        ``limit`` if given."""
+        if order_by is None:
+            # Threshold query: scan the narrowest stretch of any clause.
+            stretches = {column: self._range(column, where) for column, _, _ in where}
+            column = min(stretches, key=lambda column: stretches[column][1] - stretches[column][0], default=None)
+            if column is None:
+                positions = np.arange(len(self.rows))
+            else:
+                start, stop = stretches[column]
+                ids = np.sort(self.columns[column].order[start:stop])
+                positions = self._hits(ids, where, column)[1]
+            return positions if limit is None else positions[:limit]
+
+        sorted_column = self.columns[order_by]
+        start, stop = self._range(order_by, where)
+        order = sorted_column.order[start:stop] if ascending else sorted_column.order[start:stop][::-1]
+        if limit is None:
+            ids, positions = self._hits(order, where, order_by)
+        else:
+            # Walk from the best end in growing steps until ``limit`` rows
+            # are found, then finish the run of values tied with the last.
+            step = max(MIN_WALK, 2 * limit * self.size // max(len(self.rows), 1))
+            seen = 0
+            found = np.empty(0, dtype=order.dtype)
+            while seen < len(order) and len(found) < limit:
+                found = np.concatenate((found, self._hits(order[seen:seen + step], where, order_by)[0]))
+                seen += step
+                step *= 2
+            if len(found) >= limit:
+                last = sorted_column.column[found[limit - 1]]
+                values = sorted_column.values[start:stop]
+                tied = (np.searchsorted(values, last, side='right') if ascending
+                        else len(values) - np.searchsorted(values, last, side='left'))
+                found = np.concatenate((found, self._hits(order[seen:max(seen, tied)], where, order_by)[0]))
+            ids = found
+            positions = self._positions(ids)
+        if not ascending:
+            # The permutation is stable, so ascending walks already list
+            # ties in row order; descending ones list them reversed.
+            positions = positions[np.lexsort((ids, _keys(sorted_column.column[ids], ascending)))]
+        if not any(column == order_by for column, _, _ in where) and (limit is None or len(positions) < limit):
+            # Rows missing the value sort last, in row order.
+            missing = self._hits(sorted_column.order[sorted_column.valid:], where, order_by)[1]
+            positions = np.concatenate((positions, missing))
+        return positions if limit is None else positions[:limit]
@@ -0,0 +1,187 @@
+"""Batch reports: every CSV of a directory rendered to static HTML.
+
+    python -m swiggy.report DATA_DIR -o reports [--per-city] [--jobs N]
+
+Each file is loaded and analysed in its own worker process, so a
+directory of files scales across cores.  A report is one HTML page of
+all sections: tables as HTML, Plotly charts as embedded HTML and
+rendered images as PNG files next to it.  plotly.js is saved once per
+output directory as ``plotly.min.js``, so reports open without network
+access.  With ``--per-city`` every city also gets its own page.  A per-file timing summary is printed at
+the end.
+"""
+import argparse
+import html
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# Workers have no display; select the non-interactive backend before the
+# correlation section first imports matplotlib.
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+from swiggy import charts, engine, ingest  # noqa: E402
+
+# Tables longer than this are cut in the report.
+MAX_TABLE_ROWS = 1000
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ background: #1e1e1e; color: #e0e0e0; font-family: sans-serif; margin: 2em; }}
+h1, h2 {{ color: #FFD700; }}
+table {{ border-collapse: collapse; font-size: 0.85em; }}
+th, td {{ border: 1px solid #444; padding: 2px 6px; }}
+.note {{ white-space: pre-line; color: #bbb; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+{body}
+</body>
+</html>
+"""
+
+
+def slug(text):
+    return re.sub(r'[^A-Za-z0-9]+', '-', str(text)).strip('-').lower() or 'report'
+
+
+def render_block(block, directory, name, plotlyjs):
+    """HTML for one :class:`~swiggy.sections.Block`; images are saved as
+    ``name``.png in ``directory``."""
+    kind, value = block
+    if kind == 'subheader':
+        return f"<h3>{html.escape(value)}</h3>"
+    if kind in ('markdown', 'info'):
+        return f'<div class="note">{html.escape(value.strip().lstrip(">"))}</div>'
+    if kind == 'dataframe':
+        note = ''
+        if len(value) > MAX_TABLE_ROWS:
+            note = f'<p class="note">First {MAX_TABLE_ROWS:,} of {len(value):,} rows.</p>'
+        table = value.head(MAX_TABLE_ROWS)
+        if table.ndim == 1:
+            table = table.to_frame()
+        return table.to_html(border=0) + note
+    if kind == 'plotly':
+        return value.to_html(full_html=False, include_plotlyjs=plotlyjs)
+    if kind == 'image':
+        (directory / f"{name}.png").write_bytes(value)
+        return f'<img src="{html.escape(name)}.png" alt="">'
+    raise ValueError(f"unknown block kind {kind!r}")
+
+
+def write_plotlyjs(directory):
+    """Save the installed plotly.js as ``plotly.min.js`` in ``directory``,
+    where pages written with ``include_plotlyjs='directory'`` load it."""
+    from plotly.offline import get_plotlyjs
+    (directory / 'plotly.min.js').write_text(get_plotlyjs(), encoding='utf-8')
+
+
+def write_report(df, title, directory, stem, options):
+    """Run every section on ``df`` and write ``stem``.html into
+    ``directory``; returns (seconds computing, seconds rendering)."""
+    start = time.perf_counter()
+    results = list(engine.run(engine.context(df, **options)))
+    computed = time.perf_counter()
+    parts = []
+    # The first chart loads plotly.js from the file saved by build().
+    plotlyjs = 'directory'
+    for item, blocks in results:
+        parts.append(f"<h2>{html.escape(item.title)}</h2>")
+        for i, block in enumerate(blocks):
+            parts.append(render_block(block, directory, f"{stem}-{item.key}-{i}", plotlyjs))
+            if block.kind == 'plotly':
+                plotlyjs = False
+    page = PAGE.format(title=html.escape(title), body='\n'.join(parts))
+    (directory / f"{stem}.html").write_text(page, encoding='utf-8')
+    return computed - start, time.perf_counter() - computed
+
+
+def build(path, out_dir, per_city=False, options=None):
+    """Report(s) for one CSV file; returns its timing record."""
+    options = options or {}
+    path = Path(path)
+    directory = Path(out_dir) / slug(path.stem)
+    directory.mkdir(parents=True, exist_ok=True)
+    record = {'file': path.name, 'rows': 0, 'reports': 0, 'load': 0.0, 'compute': 0.0, 'render': 0.0}
+    start = time.perf_counter()
+    df, _ = ingest.load_csv(path)
+    record['rows'] = len(df)
+    record['load'] = time.perf_counter() - start
+    write_plotlyjs(directory)
+    pages = [(df, f"Swiggy report: {path.name}", 'index')]
+    if per_city:
+        pages += [
+            (engine.city_frame(df, city), f"Swiggy report: {path.name}, {city}", f"city-{slug(city)}")
+            for city in engine.cities(df)
+        ]
+    for frame, title, stem in pages:
+        compute, render = write_report(frame, title, directory, stem, options)
+        record['compute'] += compute
+        record['render'] += render
+        record['reports'] += 1
+    record['total'] = time.perf_counter() - start
+    return record
+
+
+def _build(path, out_dir, per_city, options):
+    # Failures are reported per file instead of aborting the whole batch.
+    try:
+        return build(path, out_dir, per_city, options)
+    except Exception as exc:
+        return {'file': Path(path).name, 'error': f"{type(exc).__name__}: {exc}"}
+
+
+def print_summary(records, wall, stream=sys.stdout):
+    header = f"{'file':30s} {'rows':>10s} {'reports':>7s} {'load':>7s} {'compute':>8s} {'render':>7s} {'total':>7s}"
+    print(header, file=stream)
+    print('-' * len(header), file=stream)
+    busy = 0.0
+    for record in records:
+        if 'error' in record:
+            print(f"{record['file'][:30]:30s} FAILED {record['error']}", file=stream)
+            continue
+        busy += record['total']
+        print(f"{record['file'][:30]:30s} {record['rows']:>10,d} {record['reports']:>7d} "
+              f"{record['load']:>6.2f}s {record['compute']:>7.2f}s {record['render']:>6.2f}s "
+              f"{record['total']:>6.2f}s", file=stream)
+    print('-' * len(header), file=stream)
+    print(f"{len(records)} files in {wall:.2f}s wall, {busy:.2f}s of work", file=stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m swiggy.report', description=__doc__.splitlines()[0])
+    parser.add_argument('directory', type=Path, help="directory of Swiggy CSV files")
+    parser.add_argument('-o', '--output', type=Path, default=Path('reports'), help="output directory")
+    parser.add_argument('--per-city', action='store_true', help="also write one report per city")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--scatter-mode', choices=charts.SCATTER_MODES, default=charts.SCATTER_MODES[0])
+    args = parser.parse_args(argv)
+
+    files = sorted(args.directory.glob('*.csv'))
+    if not files:
+        parser.error(f"no CSV files in {args.directory}")
+    options = {'scatter_mode': args.scatter_mode}
+    start = time.perf_counter()
+    records = []
+    with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(files)))) as pool:
+        futures = [pool.submit(_build, path, args.output, args.per_city, options) for path in files]
+        for future in as_completed(futures):
+            record = future.result()
+            records.append(record)
+            status = 'failed' if 'error' in record else f"{record['total']:.2f}s"
+            print(f"[{len(records)}/{len(files)}] {record['file']}: {status}", file=sys.stderr)
+    records.sort(key=lambda record: record['file'])
+    print_summary(records, time.perf_counter() - start)
+    return 1 if any('error' in record for record in records) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,532 @@
+"""Registry of the dashboard's analysis sections.
+
+Each section is a function from a :class:`SectionContext` to a list of
+:class:`Block` items (headings, tables, figures).  Sections are only
+evaluated when somebody asks for them, so the app can compute a section
+when its expander is opened and cache the result per filter state.
+"""
+import operator
+from collections import namedtuple
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from swiggy import charts, filters, quantiles, ranking
+from swiggy.aggregates import CUISINE_COUNT_DIMENSION, CUISINE_DIMENSION, METRICS
+from swiggy.comoments import CoMoments
+from swiggy.cuisines import CuisineIndex
+
+# kind is one of 'subheader', 'markdown', 'info', 'dataframe', 'plotly', 'image' (PNG bytes).
+Block = namedtuple('Block', ['kind', 'value'])
+
+# Comparisons accepted by SectionContext.select.
+OPERATORS = {
+    '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+
+
+@dataclass(frozen=True)
+class Section:
+    key: str
+    title: str
+    compute: object
+    # False for sections computed purely from per-group aggregates; those
+    # also work in streaming mode, where no row-level frame exists.
+    needs_rows: bool = True
+    dimensions: tuple = ()
+    # (dimension, metric) box summaries read through ``ctx.box``; in
+    # streaming mode these come from the running quantile sketches.
+    boxes: tuple = ()
+    # True for row-level sections that only read rows through
+    # ``ctx.select``, ``ctx.scatter`` or ``ctx.crosstab``, which a query
+    # backend answers without a frame.
+    row_queries: bool = False
+    # True for sections that only need ``ctx.correlation``; without rows
+    # it comes from the backend's co-moment accumulators.
+    moments: bool = False
+
+
+class SectionContext:
+    """What a section may read: the filtered rows (``df``, None in
+    streaming mode; with ``rows``, the positions of the filtered rows in
+    the dataset ``df``, copied out only when a section reads them), the
+    per-group aggregates (``groups``), the cuisine
+    matrix of ``df`` (``cuisines``, built on first use if not given),
+    display options (scatter reduction mode and point limit) and
+    optionally the dataset's :class:`~swiggy.ranking.Ranking` of the rows
+    of ``df`` (``ranks``), which answers :meth:`select` without sorting,
+    and the :class:`~swiggy.comoments.CoMoments` of those rows
+    (``moments``), which answer :meth:`correlation` without a pass over
+    them."""
+
+    def __init__(self, df=None, groups=None, scatter_mode='density', scatter_max_points=charts.SCATTER_MAX_POINTS,
+                 cuisines=None, ranks=None, moments=None, rows=None):
+        self.source = df
+        self.rows = rows
+        self._df = df if rows is None else None
+        self.groups = groups
+        self.scatter_mode = scatter_mode
+        self.scatter_max_points = scatter_max_points
+        self.cuisines = cuisines
+        self.ranks = ranks
+        self.moments = moments
+
+    @property
+    def has_rows(self):
+        return self.source is not None
+
+    @property
+    def df(self):
+        """The filtered rows, copied out of the dataset on first use."""
+        if self._df is None and self.source is not None:
+            self._df = filters.view(self.source, self.rows)
+        return self._df
+
+    def columns(self, names):
+        """The columns ``names`` (those present) of the filtered rows; until
+        :attr:`df` is needed, only these columns are copied."""
+        frame = self._df if self._df is not None else self.source
+        frame = frame[[name for name in names if name in frame.columns]]
+        return frame if self._df is not None else filters.view(frame, self.rows)
+
+    def take(self, positions):
+        """The filtered rows at ``positions``."""
+        if self._df is not None:
+            return self._df.take(positions)
+        return self.source.take(self.rows[positions])
+
+    def select(self, where=(), order_by=None, ascending=True, limit=None, columns=None):
+        """Rows matching every ``(column, operator, value)`` of ``where``,
+        sorted by ``order_by`` and cut to ``limit`` rows if given."""
+        if not self.has_rows:
+            return self.groups.select(where, order_by, ascending, limit, columns)
+        if self.ranks is not None and self.ranks.supports(where, order_by):
+            df = self.take(self.ranks.select(where, order_by, ascending, limit))
+        else:
+            df = self.df
+            for column, op, value in where:
+                df = df[OPERATORS[op](df[column], value)]
+            if order_by is not None and limit is not None and pd.api.types.is_numeric_dtype(df[order_by]):
+                values = df[order_by].to_numpy(dtype='float64', na_value=np.nan)
+                df = df.take(ranking.top_k(values, limit, ascending))
+            elif order_by is not None:
+                df = df.sort_values(by=order_by, ascending=ascending, kind='stable')
+        if columns is not None:
+            df = df[columns]
+        return df if limit is None else df.head(limit)
+
+    def correlation(self):
+        """Correlation matrix of the metrics over the rows with all of them,
+        or None if there are none."""
+        if self.moments is None:
+            self.moments = CoMoments.from_frame(self.columns(METRICS)) if self.has_rows else self.groups.moments
+        return self.moments.correlation()
+
+    def cuisine_index(self):
+        if self.cuisines is None:
+            self.cuisines = CuisineIndex.from_series(self.columns(['Food type'])['Food type'])
+        return self.cuisines
+
+    def scatter(self, x, y, color, **kwargs):
+        """Scatter plot of the rows, reduced above the point limit (see
+        :func:`swiggy.charts.scatter`).  Without rows, the query backend
+        returns the points or, above the limit, the density grid; it draws
+        no samples."""
+        names = [x, y, color]
+        if not self.has_rows:
+            rows = self.groups.rows
+        else:
+            rows = len(self._df) if self._df is not None else len(self.rows)
+        if rows <= self.scatter_max_points or (self.scatter_mode != 'density' and self.has_rows):
+            # A density grid has no per-row hover labels.
+            names += list(kwargs.get('hover_data', []))
+        if self.has_rows:
+            return charts.scatter(self.columns(names), x, y, color, mode=self.scatter_mode,
+                                  max_points=self.scatter_max_points, **kwargs)
+        if rows <= self.scatter_max_points:
+            return px.scatter(self.groups.select(limit=rows, columns=names), x=x, y=y, color=color, **kwargs)
+        kwargs.pop('hover_data', None)
+        title = charts.density_title(kwargs.pop('title', None), rows)
+        return charts.density_figure(self.groups.density_grid(x, y, color), x, y, color, title=title, **kwargs)
+
+    def crosstab(self, index, columns, keys=None):
+        """Row counts per ``index`` and ``columns`` value, as
+        ``pd.crosstab`` gives them, over the rows whose ``index`` is in
+        ``keys`` if given."""
+        if not self.has_rows:
+            return self.groups.crosstab(index, columns, keys)
+        df = self.columns([index, columns])
+        if keys is not None:
+            df = df[df[index].isin(keys)]
+        return pd.crosstab(df[index], df[columns])
+
+    def box_summary(self, by, value, keys=None):
+        """Box summary and outliers of ``value`` per ``by``, restricted to
+        (and ordered like) ``keys`` if given."""
+        if self.has_rows:
+            if by == CUISINE_COUNT_DIMENSION:
+                df = pd.DataFrame({by: self.cuisine_index().counts, value: self.columns([value])[value].to_numpy()})
+            else:
+                df = self.columns([by, value])
+            df = df if keys is None else df[df[by].isin(keys)]
+            summary, outliers = quantiles.box_summary(df, by, value)
+        else:
+            summary, outliers = self.groups.box_summary(by, value)
+        if keys is not None:
+            summary = summary.reindex([key for key in keys if key in summary.index])
+            outliers = outliers[outliers[by].isin(keys)]
+        return summary, outliers
+
+    def box(self, by, value, keys=None, **kwargs):
+        return charts.box(*self.box_summary(by, value, keys), by, value, **kwargs)
+
+
+SECTIONS = []
+
+
+def section(key, title, needs_rows=True, dimensions=(), boxes=(), row_queries=False, moments=False):
+    def register(compute):
+        SECTIONS.append(Section(key, title, compute, needs_rows, tuple(dimensions), tuple(boxes), row_queries,
+                                moments))
+        return compute
+    return register
+
+
+def get(key):
+    for item in SECTIONS:
+        if item.key == key:
+            return item
+    raise KeyError(key)
+
+
+def available(ctx):
+    """Sections that can be computed from ``ctx``, in display order."""
+    return [
+        item for item in SECTIONS
+        if (ctx.has_rows or not item.needs_rows
+            or (item.row_queries and getattr(ctx.groups, 'row_queries', False)))
+        and all(ctx.groups.group_table(dimension) is not None for dimension in item.dimensions)
+        and (ctx.has_rows or all(ctx.groups.has_box(*box) for box in item.boxes))
+        and (ctx.has_rows or not item.moments or getattr(ctx.groups, 'has_moments', False))
+    ]
+
+
+def group_metric(groups, dimension, metric, stat='mean'):
+    """One column of a per-group table, named like the equivalent groupby
+    (or, for ``metric='rows'``, value_counts) result."""
+    name = 'count' if metric == 'rows' else metric
+    return groups.group_table(dimension)[(metric, stat)].rename(name).rename_axis(dimension)
+
+
+def top_groups(groups, dimension, n):
+    """The ``n`` most frequent values of ``dimension``, like ``value_counts().head(n)``."""
+    return group_metric(groups, dimension, 'rows', 'count').nlargest(n)
+
+
+def plotly(fig):
+    return Block('plotly', fig)
+
+
+def table(df):
+    """A dataframe block, plus a note if a query backend cut the rows short
+    (it then records the full count in ``df.attrs['total_rows']``)."""
+    blocks = [Block('dataframe', df)]
+    total = df.attrs.get('total_rows', len(df))
+    if total > len(df):
+        blocks.append(Block('markdown', f"_First {len(df):,} of {total:,} rows._"))
+    return blocks
+
+
+@section('price_by_city', "1. 📦 Price Distribution by City", needs_rows=False, boxes=[('City', 'Price')])
+def price_by_city(ctx):
+    fig1 = ctx.box('City', 'Price', title='Price Distribution by City',
+                   color_discrete_sequence=px.colors.sequential.Viridis,
+                   template="plotly_dark")
+    return [
+        plotly(fig1),
+        Block('markdown', """>
+        - Median price across cities is ₹250–₹350
+        - Mumbai shows higher price variability
+        - All cities have outliers (up to ₹2500)
+        """),
+    ]
+
+
+@section('price_vs_rating', "2. ⭐ Price vs Average Rating", row_queries=True)
+def price_vs_rating(ctx):
+    fig_plotly_scatter = ctx.scatter('Price', 'Avg ratings', 'City',
+                                     title='Price vs. Average Rating',
+                                     hover_data=['Restaurant', 'Food type'],
+                                     color_discrete_sequence=px.colors.qualitative.Plotly,
+                                     template="plotly_dark")
+    return [
+        plotly(fig_plotly_scatter),
+        Block('markdown', """>
+        - Most listings are ₹100–₹500 with ratings 3.5–5.0
+        - No strong correlation between price and rating
+        """),
+    ]
+
+
+@section('outliers', "3. ⚠ Outlier Detection", row_queries=True)
+def outliers(ctx):
+    return [
+        Block('subheader', "Restaurants with ₹0 Price"),
+        *table(ctx.select([('Price', '==', 0)])),
+        Block('subheader', "Restaurants with Price > ₹1300"),
+        *table(ctx.select([('Price', '>', 1300)])),
+    ]
+
+
+@section('avg_price_by_food', "4. 💰 Average Price by Food Type", needs_rows=False)
+def avg_price_by_food(ctx):
+    avg_price_by_food = group_metric(ctx.groups, 'Food type', 'Price').nlargest(10)
+    fig_avg_price = px.bar(avg_price_by_food, x=avg_price_by_food.index, y=avg_price_by_food.values,
+                           title='Average Price by Food Type',
+                           color=avg_price_by_food.values,
+                           color_continuous_scale=px.colors.sequential.Plasma,
+                           template="plotly_dark")
+    fig_avg_price.update_layout(xaxis_title="Food Type", yaxis_title="Average Price")
+    return [Block('subheader', "Average Price by Food Type (Top 10)"), plotly(fig_avg_price)]
+
+
+@section('top_rated', "5. 🌟 Top-Rated Restaurants by City", row_queries=True)
+def top_rated(ctx):
+    top = ctx.select(order_by='Avg ratings', ascending=False, limit=10,
+                     columns=['Restaurant', 'City', 'Avg ratings', 'Price'])
+    return [Block('subheader', "Top-Rated Restaurants by Average Rating (Top 10)"), Block('dataframe', top)]
+
+
+@section('popular_cuisines', "6. 🍽 Most Popular Cuisines (Top 10)", needs_rows=False,
+         dimensions=[CUISINE_DIMENSION])
+def popular_cuisines(ctx):
+    top_food_volume = top_groups(ctx.groups, CUISINE_DIMENSION, 10)
+    fig_volume = px.bar(top_food_volume, x=top_food_volume.values, y=top_food_volume.index,
+                        orientation='h', title='Most Popular Cuisines',
+                        color_discrete_sequence=px.colors.qualitative.Vivid,
+                        template="plotly_dark")
+    fig_volume.update_layout(xaxis_title="Count", yaxis_title="Cuisine")
+    return [Block('subheader', "Most Popular Cuisines"), plotly(fig_volume)]
+
+
+@section('delivery_vs_rating', "7. 🕒 Delivery Time vs Rating", row_queries=True)
+def delivery_vs_rating(ctx):
+    fig4 = ctx.scatter('Delivery time', 'Avg ratings', 'City',
+                       title='Delivery Time vs Rating',
+                       color_discrete_sequence=px.colors.qualitative.T10,
+                       template="plotly_dark")
+    return [plotly(fig4)]
+
+
+@section('cuisine_ratings', "8. 🥗 Cuisine Popularity vs Average Rating", needs_rows=False,
+         dimensions=[CUISINE_DIMENSION])
+def cuisine_ratings(ctx):
+    cuisine_ratings = group_metric(ctx.groups, CUISINE_DIMENSION, 'Avg ratings').nlargest(10)
+    fig_cuisine_ratings = px.bar(cuisine_ratings, x=cuisine_ratings.values, y=cuisine_ratings.index,
+                                 orientation='h', title='Average Rating for Popular Cuisines',
+                                 color_discrete_sequence=px.colors.sequential.Blues, template="plotly_dark")
+    fig_cuisine_ratings.update_layout(xaxis_title="Average Rating", yaxis_title="Cuisine")
+    return [
+        Block('subheader', "Average Rating for Popular Cuisines (Top 10)"),
+        plotly(fig_cuisine_ratings),
+        Block('dataframe', cuisine_ratings),
+    ]
+
+
+@section('top_cities', "9. 🏙 Top Cities by Restaurant Count", needs_rows=False)
+def top_cities(ctx):
+    city_counts = top_groups(ctx.groups, 'City', 10)
+    fig_city = px.bar(city_counts, x=city_counts.index, y=city_counts.values,
+                      title='Top Cities by Restaurant Count',
+                      color_discrete_sequence=px.colors.qualitative.Pastel,
+                      template="plotly_dark")
+    fig_city.update_layout(xaxis_title="City", yaxis_title="Count")
+    return [Block('subheader', "Top 10 Cities by Restaurant Count"), plotly(fig_city)]
+
+
+@section('price_vs_delivery', "10. ⏱ Price vs Delivery Time", row_queries=True)
+def price_vs_delivery(ctx):
+    fig_plotly_price_delivery = ctx.scatter('Price', 'Delivery time', 'City',
+                                            title='Price vs. Delivery Time',
+                                            hover_data=['Restaurant'],
+                                            color_discrete_sequence=px.colors.qualitative.T10,
+                                            template="plotly_dark")
+    return [plotly(fig_plotly_price_delivery)]
+
+
+@section('price_top5_food', "11. 🧾 Price Distribution for Top 5 Food Types", needs_rows=False,
+         boxes=[('Food type', 'Price')])
+def price_top5_food(ctx):
+    top_foods = top_groups(ctx.groups, 'Food type', 5).index
+    fig7 = ctx.box('Food type', 'Price', keys=top_foods,
+                   title='Price Distribution for Top 5 Food Types',
+                   color_discrete_sequence=px.colors.sequential.Sunset,
+                   template="plotly_dark")
+    return [plotly(fig7)]
+
+
+@section('city_price_range', "12. 💸 Cheapest and Costliest Cities", needs_rows=False)
+def city_price_range(ctx):
+    city_price_agg = pd.DataFrame({
+        stat: group_metric(ctx.groups, 'City', 'Price', stat) for stat in ['min', 'max', 'mean']
+    }).reset_index()
+    fig_city_price = px.bar(city_price_agg.sort_values(by='mean', ascending=False), x='City', y='mean',
+                            color='City', title='Cheapest and Costliest Cities by Average Price',
+                            color_discrete_sequence=px.colors.qualitative.D3, template="plotly_dark")
+    fig_city_price.update_layout(xaxis_title="City", yaxis_title="Average Price")
+    return [
+        Block('subheader', "Cheapest and Costliest Cities (by average price)"),
+        plotly(fig_city_price),
+        Block('dataframe', city_price_agg.sort_values(by='mean', ascending=False)),
+    ]
+
+
+@section('rating_per_food', "13. ⭐ Rating Distribution per Food Type", needs_rows=False)
+def rating_per_food(ctx):
+    fig8 = px.bar(group_metric(ctx.groups, 'Food type', 'Avg ratings').nlargest(10),
+                  orientation='h', title='Average Rating per Food Type',
+                  color_discrete_sequence=px.colors.qualitative.Light24,
+                  template="plotly_dark")
+    return [Block('subheader', "Average Rating Distribution per Food Type"), plotly(fig8)]
+
+
+@section('low_rated', "14. 👎 Low-Rated Restaurants (Rating < 3.0)", row_queries=True)
+def low_rated(ctx):
+    return [
+        Block('subheader', "Low-Rated Restaurants (Rating < 3.0)"),
+        *table(ctx.select([('Avg ratings', '<', 3.0)], columns=['Restaurant', 'City', 'Avg ratings', 'Price'])),
+    ]
+
+
+@section('avg_price_by_area', "15. 🏘 Average Price by Area", needs_rows=False, dimensions=['Area'])
+def avg_price_by_area(ctx):
+    avg_price_by_area = group_metric(ctx.groups, 'Area', 'Price').sort_values(ascending=False)
+    fig_avg_area_price = px.bar(avg_price_by_area, x=avg_price_by_area.index, y=avg_price_by_area.values,
+                                title='Average Price by Area',
+                                color=avg_price_by_area.values,
+                                color_continuous_scale=px.colors.sequential.Viridis,
+                                template="plotly_dark")
+    fig_avg_area_price.update_layout(xaxis_title="Area", yaxis_title="Average Price")
+    return [Block('subheader', "Average Price by Area"), plotly(fig_avg_area_price)]
+
+
+@section('correlation', "16. Correlation Matrix", needs_rows=False, moments=True)
+def correlation(ctx):
+    blocks = [Block('subheader', "Correlation between Price, Rating, and Delivery Time")]
+    matrix = ctx.correlation()
+    if matrix is None:
+        return blocks + [Block('info', "Insufficient data to calculate correlation.")]
+    return blocks + [Block('image', charts.heatmap(matrix))]
+
+
+@section('price_by_cuisine_count', "17. Price Trend by Cuisine Count", needs_rows=False,
+         boxes=[(CUISINE_COUNT_DIMENSION, 'Price')])
+def price_by_cuisine_count(ctx):
+    summary, outliers = ctx.box_summary(CUISINE_COUNT_DIMENSION, 'Price')
+    fig_cuisine_count = charts.box(summary.sort_index(), outliers, CUISINE_COUNT_DIMENSION, 'Price',
+                                   title='Price Distribution by Cuisine Count',
+                                   color_discrete_sequence=px.colors.sequential.Plasma,
+                                   template="plotly_dark")
+    return [Block('subheader', "Price vs Cuisine Count"), plotly(fig_cuisine_count)]
+
+
+@section('top_rating_cities', "18. Top Cities with Highest Average Ratings", needs_rows=False)
+def top_rating_cities(ctx):
+    top_rating_cities = group_metric(ctx.groups, 'City', 'Avg ratings').nlargest(10)
+    fig_top_rating_cities = px.bar(top_rating_cities, x=top_rating_cities.index, y=top_rating_cities.values,
+                                   title='Top Cities by Average Rating',
+                                   color=top_rating_cities.values,
+                                   color_continuous_scale=px.colors.sequential.Agsunset,
+                                   template="plotly_dark")
+    fig_top_rating_cities.update_layout(xaxis_title="City", yaxis_title="Average Rating")
+    return [
+        Block('subheader', "Top Cities with Highest Average Ratings"),
+        plotly(fig_top_rating_cities),
+        Block('dataframe', top_rating_cities),
+    ]
+
+
+@section('delivery_by_city', "19. Delivery Time Distribution by City", needs_rows=False,
+         boxes=[('City', 'Delivery time')])
+def delivery_by_city(ctx):
+    fig_del_time = ctx.box('City', 'Delivery time',
+                           title='Delivery Time Distribution by City',
+                           color_discrete_sequence=px.colors.qualitative.T10,
+                           template="plotly_dark")
+    return [Block('subheader', "Delivery Time Distribution by City"), plotly(fig_del_time)]
+
+
+@section('top_food_volume', "20. Top Food Types by Volume", needs_rows=False)
+def top_food_volume(ctx):
+    top_food_volume = top_groups(ctx.groups, 'Food type', 20)
+    fig_volume_20 = px.bar(top_food_volume, x=top_food_volume.index, y=top_food_volume.values,
+                           title='Top 20 Food Types by Volume',
+                           color=top_food_volume.values,
+                           color_continuous_scale=px.colors.sequential.Viridis,
+                           template="plotly_dark")
+    fig_volume_20.update_layout(xaxis_title="Food Type", yaxis_title="Count")
+    return [Block('subheader', "Top 20 Food Types by Volume"), plotly(fig_volume_20)]
+
+
+@section('delivery_by_food', "21. Average Delivery Time by Food Type", needs_rows=False)
+def delivery_by_food(ctx):
+    delivery_by_food = group_metric(ctx.groups, 'Food type', 'Delivery time').nlargest(10)
+    fig_delivery_by_food = px.bar(delivery_by_food, x=delivery_by_food.index, y=delivery_by_food.values,
+                                  title='Average Delivery Time by Food Type',
+                                  color=delivery_by_food.values,
+                                  color_continuous_scale=px.colors.sequential.Sunset,
+                                  template="plotly_dark")
+    fig_delivery_by_food.update_layout(xaxis_title="Food Type", yaxis_title="Average Delivery Time")
+    return [
+        Block('subheader', "Average Delivery Time by Food Type (Top 10)"),
+        plotly(fig_delivery_by_food),
+        Block('dataframe', delivery_by_food),
+    ]
+
+
+@section('food_vs_rating', "22. Food Type vs Average Rating (Bar Chart)", needs_rows=False)
+def food_vs_rating(ctx):
+    fig9 = px.bar(group_metric(ctx.groups, 'Food type', 'Avg ratings').nlargest(10).iloc[::-1],
+                  orientation='h', title='Top 10 Food Types by Average Rating',
+                  color_discrete_sequence=px.colors.sequential.Rainbow,
+                  template="plotly_dark")
+    return [Block('subheader', "Food Type vs Average Rating"), plotly(fig9)]
+
+
+@section('price_top10_food', "23. Food Type vs Price Distribution (Box Plot)", needs_rows=False,
+         boxes=[('Food type', 'Price')])
+def price_top10_food(ctx):
+    top_food_types = top_groups(ctx.groups, 'Food type', 10).index
+    fig10 = ctx.box('Food type', 'Price', keys=top_food_types, orientation='h',
+                    title='Price Distribution for Top 10 Food Types',
+                    color_discrete_sequence=px.colors.qualitative.G10,
+                    template="plotly_dark")
+    return [Block('subheader', "Price Distribution for Top 10 Food Types"), plotly(fig10)]
+
+
+@section('cheapest_items', "24. Cheapest Food Items", row_queries=True)
+def cheapest_items(ctx):
+    cheapest_items = ctx.select([('Price', '>', 0)], order_by='Price', limit=10,
+                                columns=['Restaurant', 'Food type', 'Price', 'City'])
+    return [
+        Block('subheader', "Cheapest Food Items (Top 10)"),
+        Block('dataframe', cheapest_items),
+    ]
+
+
+@section('top_food_per_city', "25. Top 5 Food Types in Each City (Stacked Bar)", row_queries=True)
+def top_food_per_city(ctx):
+    top_cities = top_groups(ctx.groups, 'City', 5).index
+    food_city_counts = ctx.crosstab('City', 'Food type', top_cities)
+
+    common_food_types_in_top_cities = food_city_counts.sum(axis=0).nlargest(5).index
+    food_city_counts = food_city_counts[common_food_types_in_top_cities]
+
+    fig12 = px.bar(food_city_counts.T, x=food_city_counts.T.index, y=food_city_counts.T.columns,
+                   title="Top 5 Food Types in Top 5 Cities",
+                   template="plotly_dark")
+    fig12.update_layout(xaxis_title="Food Type", yaxis_title="Count")
+    return [Block('subheader', "Top 5 Food Types in Each City"), plotly(fig12)]
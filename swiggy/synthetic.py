@@ -0,0 +1,127 @@
+"""Deterministic Swiggy-shaped test data.
+
+    python -m swiggy.synthetic ROWS OUT.csv [--seed N]
+
+Rows are generated in fixed-size blocks, each from its own seeded random
+stream, so the output depends only on ``rows`` and ``seed`` and any scale
+(1K to tens of millions of rows) is written in bounded memory.  Cities
+and cuisines follow skewed popularity, 'Food type' holds comma-separated
+cuisine lists, prices are log-normal with ₹0 and >₹1300 outliers, and
+about 1% of listings are unrated.
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Rows per generated block; fixed so that output does not depend on how
+# it is consumed.
+BLOCK_ROWS = 100_000
+
+CITIES = ['Bangalore', 'Mumbai', 'Delhi', 'Hyderabad', 'Chennai', 'Kolkata', 'Pune', 'Ahmedabad']
+CUISINES = [
+    'North Indian', 'Chinese', 'South Indian', 'Biryani', 'Fast Food', 'Pizzas', 'Desserts',
+    'Beverages', 'Snacks', 'Street Food', 'Ice Cream', 'Bakery', 'Italian', 'Continental',
+    'Mughlai', 'Andhra', 'Chettinad', 'Kerala', 'Bengali', 'Gujarati', 'Rajasthani', 'Punjabi',
+    'Thai', 'Asian', 'American', 'Burgers', 'Healthy Food', 'Salads', 'Seafood', 'Tandoor',
+]
+AREAS_PER_CITY = 40
+FOOD_TYPE_COMBOS = 3_000
+RESTAURANT_NAMES = 20_000
+COLUMNS = ['ID', 'Area', 'City', 'Restaurant', 'Price', 'Avg ratings', 'Total ratings',
+           'Food type', 'Address', 'Delivery time']
+# Shares of the outlier prices that the dashboard calls out.
+ZERO_PRICE_SHARE = 0.002
+HIGH_PRICE_SHARE = 0.003
+UNRATED_SHARE = 0.01
+
+
+def _zipf_weights(n, exponent=1.1):
+    weights = 1 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+class _Vocabulary:
+    """Value pools shared by every block (drawn once from ``seed``)."""
+
+    def __init__(self, seed):
+        rng = np.random.default_rng([seed, 0])
+        self.city_weights = _zipf_weights(len(CITIES), 0.6)
+        self.areas = np.array([f"{city} Area {i + 1}" for city in CITIES for i in range(AREAS_PER_CITY)], dtype=object)
+        self.addresses = np.array([f"{area}, {area.rsplit(' Area', 1)[0]}" for area in self.areas], dtype=object)
+        self.area_weights = _zipf_weights(AREAS_PER_CITY, 0.8)
+
+        # Cuisine lists of 1-4 distinct cuisines, popular cuisines first.
+        cuisine_weights = _zipf_weights(len(CUISINES))
+        combos = set()
+        while len(combos) < FOOD_TYPE_COMBOS:
+            size = rng.choice([1, 2, 3, 4], p=[0.3, 0.35, 0.25, 0.1])
+            combos.add(tuple(rng.choice(len(CUISINES), size, replace=False, p=cuisine_weights)))
+        self.food_types = np.array([', '.join(CUISINES[i] for i in combo) for combo in sorted(combos)], dtype=object)
+        self.food_type_weights = _zipf_weights(FOOD_TYPE_COMBOS, 0.9)[rng.permutation(FOOD_TYPE_COMBOS)]
+        self.restaurants = np.array([f"Restaurant {i}" for i in range(RESTAURANT_NAMES)], dtype=object)
+        self.restaurant_weights = _zipf_weights(RESTAURANT_NAMES, 0.7)
+
+
+def _block(vocabulary, seed, index, start, rows):
+    rng = np.random.default_rng([seed, index + 1])
+    city = rng.choice(len(CITIES), rows, p=vocabulary.city_weights)
+    area = city * AREAS_PER_CITY + rng.choice(AREAS_PER_CITY, rows, p=vocabulary.area_weights)
+
+    price = np.round(rng.lognormal(5.6, 0.5, rows) / 10) * 10
+    draw = rng.random(rows)
+    price[draw < ZERO_PRICE_SHARE] = 0
+    high = draw > 1 - HIGH_PRICE_SHARE
+    price[high] = np.round(rng.uniform(1300, 2500, int(high.sum())) / 10) * 10
+
+    rating = np.round(np.clip(rng.normal(4.0, 0.35, rows), 1.0, 5.0), 1)
+    rating[rng.random(rows) < UNRATED_SHARE] = np.nan
+    total_ratings = np.minimum(rng.pareto(1.2, rows) * 20, 10_000).astype(np.int64)
+    # Delivery times grow a little with price (more elaborate food).
+    delivery = np.clip(rng.gamma(9, 5, rows) + price / 100, 15, 120).astype(np.int64)
+
+    return pd.DataFrame({
+        'ID': np.arange(start, start + rows),
+        'Area': vocabulary.areas[area],
+        'City': np.asarray(CITIES, dtype=object)[city],
+        'Restaurant': vocabulary.restaurants[rng.choice(RESTAURANT_NAMES, rows, p=vocabulary.restaurant_weights)],
+        'Price': price,
+        'Avg ratings': rating,
+        'Total ratings': total_ratings,
+        'Food type': vocabulary.food_types[rng.choice(FOOD_TYPE_COMBOS, rows, p=vocabulary.food_type_weights)],
+        'Address': vocabulary.addresses[area],
+        'Delivery time': delivery,
+    }, columns=COLUMNS)
+
+
+def generate(rows, seed=0):
+    """Yield the dataset as consecutive frames of up to :data:`BLOCK_ROWS` rows."""
+    vocabulary = _Vocabulary(seed)
+    for index, start in enumerate(range(0, max(rows, 1), BLOCK_ROWS)):
+        yield _block(vocabulary, seed, index, start, min(BLOCK_ROWS, rows - start))
+
+
+def frame(rows, seed=0):
+    """The whole dataset as one frame."""
+    return pd.concat(generate(rows, seed), ignore_index=True)
+
+
+def write_csv(path, rows, seed=0):
+    """Write the dataset to ``path`` block by block."""
+    for index, block in enumerate(generate(rows, seed)):
+        block.to_csv(path, mode='w' if index == 0 else 'a', header=index == 0, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m swiggy.synthetic', description=__doc__.splitlines()[0])
+    parser.add_argument('rows', type=int)
+    parser.add_argument('output')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    write_csv(args.output, args.rows, args.seed)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
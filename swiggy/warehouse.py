@@ -0,0 +1,454 @@
+"""Optional on-disk backend: an upload loaded once into a DuckDB file.
+
+The CSV is parsed by DuckDB into a columnar database file named after the
+upload's fingerprint, so every session (and every process) opens the same
+file read-only instead of holding its own copy of the rows.  Sidebar
+filters become a SQL ``WHERE`` clause; group statistics, box summaries and
+row lookups are SQL queries, and only their small results reach pandas.
+
+``duckdb`` is an optional dependency, imported on first use.
+"""
+import importlib.util
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from swiggy.aggregates import CUISINE_COUNT_DIMENSION, CUISINE_DIMENSION, GROUP_DIMENSIONS, METRICS
+from swiggy.charts import DENSITY_BINS, bin_centers, bin_edges
+from swiggy.comoments import CoMoments
+from swiggy.ingest import CATEGORICAL_COLUMNS
+from swiggy.quantiles import MAX_OUTLIERS, SUMMARY_COLUMNS
+
+TABLE = 'restaurants'
+# List column holding each row's cuisines (see swiggy.cuisines).
+CUISINES_COLUMN = '__cuisines'
+# Row lookups (e.g. every ₹0 listing) return at most this many rows; a cut
+# result records the full count in ``attrs['total_rows']``.
+MAX_RESULT_ROWS = 10_000
+# Where database files are kept; shared by all sessions on the machine.
+DIRECTORY = Path(os.environ.get('SWIGGY_WAREHOUSE_DIR', Path(tempfile.gettempdir()) / 'swiggy-warehouse'))
+# Database files are pruned on every open: the most recently used
+# KEEP_DATASETS are kept, and none that has been unused for KEEP_SECONDS.
+KEEP_DATASETS = 8
+KEEP_SECONDS = 24 * 60 * 60
+OPERATORS = ('==', '!=', '<', '<=', '>', '>=')
+
+# 'Food type' spelled as swiggy.cuisines.canonicalize does: trimmed,
+# de-duplicated, sorted cuisines.
+_CUISINE_LIST = ("list_sort(list_distinct(list_filter(list_transform(string_split(\"Food type\", ','), "
+                 "lambda x: trim(x)), lambda x: x <> '')))")
+
+
+def available():
+    """Whether the optional ``duckdb`` package is installed."""
+    return importlib.util.find_spec('duckdb') is not None
+
+
+def _duckdb():
+    import duckdb
+    return duckdb
+
+
+def quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def build(csv_path, path):
+    """Load the CSV at ``csv_path`` into a new database file at ``path``.
+
+    Every column is read as text: DuckDB guesses types from a sample of
+    the file, and a '--' rating past that sample would fail the load.
+    Metrics are then parsed with ``TRY_CAST`` (so text becomes NULL, as
+    in memory), and other columns get the guessed type only if every
+    value of the file converts to it.
+    """
+    connection = _duckdb().connect(str(path))
+    try:
+        csv = "'" + str(csv_path).replace("'", "''") + "', header = true"
+        guessed = dict(row[:2] for row in connection.execute(f"DESCRIBE SELECT * FROM read_csv({csv})").fetchall())
+        columns = list(guessed)
+        select = []
+        for column in columns:
+            if column in METRICS:
+                select.append(f"TRY_CAST({quote(column)} AS DOUBLE) AS {quote(column)}")
+            elif column == 'Food type':
+                select.append(f"array_to_string({_CUISINE_LIST}, ', ') AS {quote(column)}")
+            else:
+                select.append(quote(column))
+        if 'Food type' in columns:
+            select.append(f"{_CUISINE_LIST} AS {CUISINES_COLUMN}")
+        connection.execute(f"CREATE TABLE {TABLE} AS SELECT {', '.join(select)} "
+                           f"FROM read_csv({csv}, all_varchar = true)")
+        typed = [column for column in columns
+                 if column not in METRICS and column not in CATEGORICAL_COLUMNS and guessed[column] != 'VARCHAR']
+        if typed:
+            converts = connection.execute("SELECT " + ', '.join(
+                f"count({quote(column)}) = count(TRY_CAST({quote(column)} AS {guessed[column]}))" for column in typed
+            ) + f" FROM {TABLE}").fetchone()
+            for column, ok in zip(typed, converts):
+                if ok:
+                    connection.execute(f"ALTER TABLE {TABLE} ALTER {quote(column)} TYPE {guessed[column]}")
+        connection.execute("CHECKPOINT")
+    finally:
+        connection.close()
+
+
+def prune(directory=DIRECTORY, keep=KEEP_DATASETS, max_age=KEEP_SECONDS, exclude=()):
+    """Delete the database files of ``directory`` beyond the ``keep`` most
+    recently used or unused for ``max_age`` seconds (never those in
+    ``exclude``), and build directories left behind for ``max_age``.
+
+    Files in use elsewhere are skipped where the platform refuses to
+    delete them; on POSIX open connections keep reading the unlinked file.
+    """
+    directory = Path(directory)
+    cutoff = time.time() - max_age
+    files = []
+    for path in directory.glob('*.duckdb'):
+        try:
+            files.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    files.sort(reverse=True)
+    exclude = {Path(path) for path in exclude}
+    for rank, (used, path) in enumerate(files):
+        if path not in exclude and (rank >= keep or used < cutoff):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+    for scratch in directory.glob('tmp*'):
+        try:
+            if scratch.is_dir() and scratch.stat().st_mtime < cutoff:
+                shutil.rmtree(scratch, ignore_errors=True)
+        except FileNotFoundError:
+            continue
+
+
+def open_dataset(source, fingerprint, directory=DIRECTORY):
+    """A :class:`Warehouse` over ``source`` (a path or an uploaded file),
+    building its database file unless one exists for ``fingerprint``.
+
+    Opening marks the file as used and prunes the directory (:func:`prune`).
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{fingerprint}.duckdb"
+    if path.exists():
+        os.utime(path)
+    else:
+        # Build under a private name and rename, so that concurrent builders
+        # and readers never see a half-written file.
+        with tempfile.TemporaryDirectory(dir=directory) as scratch:
+            csv_path = source
+            if hasattr(source, 'getbuffer'):
+                csv_path = Path(scratch) / 'upload.csv'
+                csv_path.write_bytes(source.getbuffer())
+            partial = Path(scratch) / 'dataset.duckdb'
+            build(csv_path, partial)
+            os.replace(partial, path)
+    warehouse = Warehouse(path)
+    prune(directory, exclude=[path])
+    return warehouse
+
+
+class Warehouse:
+    """Read-only connection to one dataset's database file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.connection = _duckdb().connect(str(self.path), read_only=True)
+        # Kept here: the file may be pruned while this connection is open.
+        self.nbytes = self.path.stat().st_size
+        described = self.query(f"DESCRIBE {TABLE}")
+        self.columns = [column for column in described['column_name'] if column != CUISINES_COLUMN]
+
+    def query(self, sql, params=()):
+        # A cursor per query: the connection is shared between threads.
+        cursor = self.connection.cursor()
+        try:
+            return cursor.execute(sql, list(params)).df()
+        finally:
+            cursor.close()
+
+    def distinct(self, column):
+        """Sorted distinct non-missing values of ``column``."""
+        if column == CUISINE_DIMENSION:
+            sql = f"SELECT DISTINCT unnest({CUISINES_COLUMN}) AS value FROM {TABLE} ORDER BY 1"
+        else:
+            sql = f"SELECT DISTINCT {quote(column)} AS value FROM {TABLE} WHERE {quote(column)} IS NOT NULL ORDER BY 1"
+        return list(self.query(sql)['value'])
+
+    def bounds(self, column):
+        """(min, max) of ``column``, or None if it has no values."""
+        row = self.query(f"SELECT min({quote(column)}) AS low, max({quote(column)}) AS high FROM {TABLE}").iloc[0]
+        return None if pd.isna(row['low']) else (row['low'], row['high'])
+
+    def view(self, cities, rating_range, price_range, cuisines=()):
+        """The rows matching a sidebar state, as a :class:`WarehouseView`."""
+        clauses = [
+            '"City" IN (SELECT unnest(?::VARCHAR[]))',
+            '"Avg ratings" BETWEEN ? AND ?',
+            '"Price" BETWEEN ? AND ?',
+        ]
+        params = [list(cities), *map(float, rating_range), *map(float, price_range)]
+        if cuisines:
+            clauses.append(f"list_has_any({CUISINES_COLUMN}, ?::VARCHAR[])")
+            params.append(list(cuisines))
+        return WarehouseView(self, ' AND '.join(clauses), params)
+
+
+class WarehouseView:
+    """Filtered rows of a :class:`Warehouse`.
+
+    Offers the statistics interface of
+    :class:`~swiggy.aggregates.GroupAggregates` (``rows``, ``total``,
+    ``group_table``) plus box summaries, co-moments and row queries, each
+    computed by one SQL query on first use.
+    """
+
+    row_queries = True
+
+    def __init__(self, warehouse, where='TRUE', params=()):
+        self.warehouse = warehouse
+        self.where = where
+        self.params = list(params)
+        self._tables = {}
+        self._totals = None
+        self._moments = None
+
+    def _source(self, dimension=None):
+        """FROM clause of the filtered rows, with the group key as ``key``."""
+        metrics = ', '.join(quote(metric) for metric in METRICS if metric in self.warehouse.columns)
+        if dimension == CUISINE_DIMENSION:
+            key = f"unnest({CUISINES_COLUMN})"
+        elif dimension == CUISINE_COUNT_DIMENSION:
+            key = f"coalesce(len({CUISINES_COLUMN}), 0)"
+        elif dimension is not None:
+            key = quote(dimension)
+        else:
+            key = 'NULL'
+        return f"(SELECT {key} AS key, {metrics} FROM {TABLE} WHERE {self.where})"
+
+    def _metrics(self):
+        return [metric for metric in METRICS if metric in self.warehouse.columns]
+
+    def _aggregates(self):
+        select = ['count(*) AS rows']
+        for i, metric in enumerate(self._metrics()):
+            column = quote(metric)
+            select += [f"count({column}) AS c{i}", f"avg({column}) AS a{i}",
+                       f"min({column}) AS l{i}", f"max({column}) AS h{i}"]
+        return ', '.join(select)
+
+    def _table(self, result, dimension=None):
+        """count/mean/min/max table in the layout of
+        :func:`swiggy.aggregates.finalize`."""
+        table = {('rows', 'count'): result['rows'].astype('int64')}
+        for i, metric in enumerate(self._metrics()):
+            table[(metric, 'count')] = result[f"c{i}"].astype('int64')
+            table[(metric, 'mean')] = result[f"a{i}"].astype('float64')
+            table[(metric, 'min')] = result[f"l{i}"].astype('float64')
+            table[(metric, 'max')] = result[f"h{i}"].astype('float64')
+        return pd.DataFrame(table, index=result.index.rename(dimension))
+
+    def _scan(self):
+        """Totals and every column dimension's table from one GROUPING SETS
+        query, i.e. a single pass over the filtered rows."""
+        dimensions = [dimension for dimension in GROUP_DIMENSIONS if dimension in self.warehouse.columns]
+        if not dimensions:
+            result = self.warehouse.query(f"SELECT {self._aggregates()} FROM {TABLE} WHERE {self.where}", self.params)
+            self._totals = self._table(result)
+            return
+        keys = ', '.join(quote(dimension) for dimension in dimensions)
+        sets = ', '.join([f"({quote(dimension)})" for dimension in dimensions] + ['()'])
+        result = self.warehouse.query(
+            f"SELECT grouping({keys}) AS grouping_set, {keys}, {self._aggregates()} "
+            f"FROM {TABLE} WHERE {self.where} GROUP BY GROUPING SETS ({sets})", self.params
+        )
+        # grouping() sets one bit per column left out of the set.
+        every = (1 << len(dimensions)) - 1
+        self._totals = self._table(result[result['grouping_set'] == every].reset_index(drop=True))
+        for i, dimension in enumerate(dimensions):
+            rows = result[(result['grouping_set'] == every ^ (1 << (len(dimensions) - 1 - i)))
+                          & result[dimension].notna()]
+            self._tables[dimension] = self._table(rows.set_index(dimension).sort_index(), dimension)
+
+    def _cuisine_table(self):
+        result = self.warehouse.query(
+            f"SELECT key, {self._aggregates()} FROM {self._source(CUISINE_DIMENSION)} "
+            "WHERE key IS NOT NULL GROUP BY key ORDER BY key", self.params
+        )
+        return self._table(result.set_index('key'), CUISINE_DIMENSION)
+
+    @property
+    def totals(self):
+        if self._totals is None:
+            self._scan()
+        return self._totals
+
+    @property
+    def rows(self):
+        return int(self.totals[('rows', 'count')].iloc[0])
+
+    def total(self, metric, stat):
+        """Overall ``stat`` (count/mean/min/max) of ``metric``."""
+        if (metric, stat) not in self.totals.columns:
+            return float('nan')
+        return self.totals[(metric, stat)].iloc[0]
+
+    def group_table(self, dimension):
+        """Per-group count/mean/min/max table for ``dimension``."""
+        if dimension == CUISINE_DIMENSION and dimension not in self._tables:
+            self._tables[dimension] = self._cuisine_table() if 'Food type' in self.warehouse.columns else None
+        elif self._totals is None:
+            self._scan()
+        return self._tables.get(dimension)
+
+    def has_box(self, dimension, metric):
+        if dimension == CUISINE_COUNT_DIMENSION:
+            return 'Food type' in self.warehouse.columns and metric in self.warehouse.columns
+        return self.group_table(dimension) is not None and metric in self.warehouse.columns
+
+    @property
+    def has_moments(self):
+        return set(METRICS) <= set(self.warehouse.columns)
+
+    @property
+    def moments(self):
+        """:class:`~swiggy.comoments.CoMoments` of the metrics over the
+        filtered rows that have all of them, from one aggregate query."""
+        if self._moments is None:
+            columns = [quote(metric) for metric in METRICS]
+            select = ['count(*) AS n'] + [f"avg({column}) AS a{i}" for i, column in enumerate(columns)]
+            select += [f"covar_pop({columns[i]}, {columns[j]}) AS c{i}{j}"
+                       for i in range(len(columns)) for j in range(i, len(columns))]
+            complete = ' AND '.join(f"{column} IS NOT NULL" for column in columns)
+            row = self.warehouse.query(
+                f"SELECT {', '.join(select)} FROM {TABLE} WHERE {self.where} AND {complete}", self.params
+            ).iloc[0]
+            count = int(row['n'])
+            mean = np.array([[row[f"a{i}"] for i in range(len(columns))]], dtype='float64')
+            m2 = np.zeros((1, len(columns), len(columns)))
+            for i in range(len(columns)):
+                for j in range(i, len(columns)):
+                    m2[0, i, j] = m2[0, j, i] = count * row[f"c{i}{j}"] if count else 0.0
+            present = slice(None) if count else slice(0)
+            self._moments = CoMoments(METRICS, pd.RangeIndex(1)[present], np.array([float(count)])[present],
+                                      mean[present], m2[present])
+        return self._moments
+
+    def box_summary(self, dimension, metric, max_outliers=MAX_OUTLIERS):
+        """Exact box summary and capped outliers, as
+        :func:`swiggy.quantiles.box_summary` returns them."""
+        value = quote(metric)
+        data = (f"data AS (SELECT key, {value} AS value, "
+                f"row_number() OVER (PARTITION BY key ORDER BY {value}) AS low_rank, "
+                f"row_number() OVER (PARTITION BY key ORDER BY {value} DESC) AS high_rank "
+                f"FROM {self._source(dimension)} WHERE key IS NOT NULL AND {value} IS NOT NULL)")
+        fences = ("fences AS (SELECT key, count(*) AS count, min(value) AS min, "
+                  "quantile_cont(value, 0.25) AS q1, quantile_cont(value, 0.5) AS median, "
+                  "quantile_cont(value, 0.75) AS q3, max(value) AS max FROM data GROUP BY key), "
+                  "bounded AS (SELECT *, greatest(q1 - 1.5 * (q3 - q1), min) AS low, "
+                  "least(q3 + 1.5 * (q3 - q1), max) AS high FROM fences)")
+        summary = self.warehouse.query(
+            f"WITH {data}, {fences} "
+            "SELECT key, any_value(count) AS count, any_value(min) AS min, any_value(q1) AS q1, "
+            "any_value(median) AS median, any_value(q3) AS q3, any_value(max) AS max, "
+            "min(value) FILTER (WHERE value BETWEEN low AND high) AS lowerfence, "
+            "max(value) FILTER (WHERE value BETWEEN low AND high) AS upperfence "
+            "FROM data JOIN bounded USING (key) GROUP BY key ORDER BY key", self.params
+        ).set_index('key').rename_axis(dimension)[SUMMARY_COLUMNS]
+        outliers = self.warehouse.query(
+            f"WITH {data}, {fences} "
+            "SELECT key, value FROM data JOIN bounded USING (key) "
+            "WHERE (value < low OR value > high) AND least(low_rank, high_rank) <= ?", self.params + [max(max_outliers // 2, 1)]
+        ).rename(columns={'key': dimension, 'value': metric})
+        return summary, outliers
+
+    def select(self, where=(), order_by=None, ascending=True, limit=None, columns=None):
+        """Rows matching ``where`` (``(column, operator, value)`` triples),
+        optionally sorted; at most ``limit`` rows, or without a limit at
+        most :data:`MAX_RESULT_ROWS`.
+
+        Ties and unsorted results come in file order, as with a stable sort
+        in memory.  A result cut at :data:`MAX_RESULT_ROWS` holds the number
+        of matching rows in ``attrs['total_rows']``.
+        """
+        clauses, params = [self.where], list(self.params)
+        for column, operator, value in where:
+            if operator not in OPERATORS:
+                raise ValueError(f"unsupported operator {operator!r}")
+            clauses.append(f"{quote(column)} {'=' if operator == '==' else operator} ?")
+            params.append(value)
+        select = ', '.join(quote(column) for column in (columns or self.warehouse.columns))
+        condition = ' AND '.join(clauses)
+        sql = f"SELECT {select} FROM {TABLE} WHERE {condition} ORDER BY "
+        if order_by is not None:
+            sql += f"{quote(order_by)} {'ASC' if ascending else 'DESC'} NULLS LAST, "
+        # rowid is the row's position in the CSV.
+        cap = MAX_RESULT_ROWS if limit is None else int(limit)
+        result = self.warehouse.query(sql + f"rowid LIMIT {cap}", params)
+        if limit is None and len(result) == MAX_RESULT_ROWS:
+            total = self.warehouse.query(f"SELECT count(*) AS n FROM {TABLE} WHERE {condition}", params)
+            result.attrs['total_rows'] = int(total['n'].iloc[0])
+        return result
+
+    def crosstab(self, index, columns, keys=None):
+        """Row counts per ``index`` and ``columns`` value, laid out like
+        ``pd.crosstab``, over the rows whose ``index`` is in ``keys`` if
+        given."""
+        clauses = [self.where, f"{quote(index)} IS NOT NULL", f"{quote(columns)} IS NOT NULL"]
+        params = list(self.params)
+        if keys is not None:
+            clauses.append(f"{quote(index)} IN (SELECT unnest(?::VARCHAR[]))")
+            params.append([str(key) for key in keys])
+        result = self.warehouse.query(
+            f"SELECT {quote(index)} AS row_key, {quote(columns)} AS column_key, count(*) AS n "
+            f"FROM {TABLE} WHERE {' AND '.join(clauses)} GROUP BY ALL", params
+        )
+        table = result.pivot(index='row_key', columns='column_key', values='n').fillna(0).astype('int64')
+        return table.rename_axis(index=index, columns=columns)
+
+    def density_grid(self, x, y, color, bins=DENSITY_BINS):
+        """Row counts per (``color`` group, x bin, y bin), binned in SQL
+        exactly as :func:`swiggy.charts.density_grid` bins them in memory."""
+        qx, qy, qcolor = quote(x), quote(y), quote(color)
+        where = f"{self.where} AND {qcolor} IS NOT NULL AND {qx} IS NOT NULL AND {qy} IS NOT NULL"
+        bounds = self.warehouse.query(
+            f"SELECT min({qx}) AS x_low, max({qx}) AS x_high, min({qy}) AS y_low, max({qy}) AS y_high "
+            f"FROM {TABLE} WHERE {where}", self.params
+        ).iloc[0]
+        if pd.isna(bounds['x_low']):
+            return pd.DataFrame(columns=[color, x, y, 'count'])
+        x_edges = bin_edges(bounds['x_low'], bounds['x_high'], bins)
+        y_edges = bin_edges(bounds['y_low'], bounds['y_high'], bins)
+
+        def guess(column):
+            return f"least(greatest(floor(({column} - ?) / ? * {bins}), 0), {bins - 1})::INTEGER"
+
+        def settle(value, guessed):
+            # Moves the arithmetic guess to the bin whose edges (the same
+            # floats as in memory) hold the value, as np.searchsorted does.
+            return (f"least(greatest({guessed} - ({value} < (?::DOUBLE[])[{guessed} + 1])::INTEGER "
+                    f"+ ({value} >= (?::DOUBLE[])[{guessed} + 2])::INTEGER, 0), {bins - 1})")
+
+        result = self.warehouse.query(
+            f"WITH cells AS (SELECT {qcolor} AS key, {qx} AS x, {qy} AS y, {guess(qx)} AS x_guess, "
+            f"{guess(qy)} AS y_guess FROM {TABLE} WHERE {where}) "
+            f"SELECT key, {settle('x', 'x_guess')} AS x_bin, {settle('y', 'y_guess')} AS y_bin, count(*) AS n "
+            "FROM cells GROUP BY ALL ORDER BY key, x_bin, y_bin",
+            [x_edges[0], x_edges[-1] - x_edges[0], y_edges[0], y_edges[-1] - y_edges[0], *self.params,
+             list(x_edges), list(x_edges), list(y_edges), list(y_edges)]
+        )
+        return pd.DataFrame({
+            color: result['key'].to_numpy(),
+            x: bin_centers(x_edges)[result['x_bin'].to_numpy()],
+            y: bin_centers(y_edges)[result['y_bin'].to_numpy()],
+            'count': result['n'].to_numpy(),
+        })
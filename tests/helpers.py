@@ -0,0 +1,33 @@
+"""Small Swiggy-shaped frames with the awkward cases the checks need."""
+import io
+
+import numpy as np
+import pandas as pd
+
+from swiggy import ingest
+
+CITIES = ['Pune', 'Delhi', 'Mumbai', 'Chennai']
+FOOD_TYPES = ['Chinese', 'North Indian, Chinese', 'Chinese, North Indian', 'Thai', 'Pizzas, Thai', 'Biryani']
+
+
+def frame(rows=2000, seed=0, missing=True):
+    """A schema-typed frame with many tied values and ₹0 prices, and unless
+    not ``missing``, missing cities, ratings and prices and '--' ratings."""
+    rng = np.random.default_rng(seed)
+    city = rng.choice(CITIES + [''], rows, p=[0.4, 0.3, 0.15, 0.1, 0.05] if missing else [0.4, 0.3, 0.2, 0.1, 0])
+    rating = np.round(rng.uniform(2.0, 5.0, rows), 1).astype(object)
+    price = (rng.integers(0, 30, rows) * 50).astype(object)
+    if missing:
+        rating[rng.random(rows) < 0.05] = '--'
+        rating[rng.random(rows) < 0.03] = ''
+        price[rng.random(rows) < 0.03] = ''
+    raw = pd.DataFrame({
+        'Restaurant': [f"R{i}" for i in range(rows)],
+        'City': city,
+        'Area': rng.choice(['A', 'B', 'C'], rows),
+        'Price': price,
+        'Avg ratings': rating,
+        'Food type': rng.choice(FOOD_TYPES + [''], rows),
+        'Delivery time': rng.integers(10, 90, rows),
+    })
+    return ingest.read_csv(io.StringIO(raw.to_csv(index=False)))
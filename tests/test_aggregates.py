@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from swiggy import aggregates, ingest
+from swiggy.aggregates import GROUP_DIMENSIONS, METRICS
+
+from tests.helpers import frame
+
+
+def grouped_stats(df, by):
+    """count/sum/min/max per group, as groupby computes them."""
+    grouped = df.groupby(by, observed=True)
+    table = {('rows', 'count'): grouped.size()}
+    for metric in METRICS:
+        values = grouped[metric]
+        table[(metric, 'count')] = values.count()
+        table[(metric, 'sum')] = values.sum().astype('float64')
+        table[(metric, 'min')] = values.min().astype('float64')
+        table[(metric, 'max')] = values.max().astype('float64')
+    return pd.DataFrame(table)
+
+
+def assert_same(actual, expected):
+    actual = actual.sort_index()
+    expected = expected.sort_index()
+    assert list(actual.index) == list(expected.index)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, check_index_type=False,
+                                  check_names=False, check_categorical=False)
+
+
+@pytest.mark.parametrize('missing', [True, False])
+@pytest.mark.parametrize('by', GROUP_DIMENSIONS)
+def test_partial_stats_match_groupby(by, missing):
+    df = frame(missing=missing)
+    assert_same(aggregates.partial_stats(df, by), grouped_stats(df, by))
+
+
+def test_overall_partial_stats():
+    df = frame()
+    overall = aggregates.partial_stats(df)
+    assert len(overall) == 1
+    assert overall[('rows', 'count')].iloc[0] == len(df)
+    for metric in METRICS:
+        assert overall[(metric, 'count')].iloc[0] == df[metric].count()
+        assert np.isclose(overall[(metric, 'sum')].iloc[0], df[metric].sum())
+        assert overall[(metric, 'min')].iloc[0] == df[metric].min()
+        assert overall[(metric, 'max')].iloc[0] == df[metric].max()
+
+
+@pytest.mark.parametrize('by', [None, 'City', 'Food type'])
+def test_merged_chunks_match_whole(by):
+    df = frame(rows=3000, seed=4)
+    chunks = [aggregates.partial_stats(df.iloc[part], by) for part in np.array_split(np.arange(len(df)), 7)]
+    merged = aggregates.merge_partials(*reversed(chunks), None)
+    assert_same(merged, aggregates.partial_stats(df, by))
+    assert aggregates.merge_partials(None) is None
+
+
+def test_stream_matches_memory(tmp_path):
+    df = frame()
+    path = tmp_path / 'data.csv'
+    df.to_csv(path, index=False)
+    stats = aggregates.stream_stats(ingest.iter_csv(path, chunksize=300))
+    assert stats.rows == len(df)
+    for dimension in GROUP_DIMENSIONS:
+        expected = aggregates.finalize(grouped_stats(df, dimension))
+        assert_same(stats.group_table(dimension), expected)
+    for metric in METRICS:
+        assert stats.total(metric, 'count') == df[metric].count()
+        assert np.isclose(stats.total(metric, 'mean'), df[metric].mean())
+
+
+def test_stream_predicate_matches_mask(tmp_path):
+    df = frame()
+    path = tmp_path / 'data.csv'
+    df.to_csv(path, index=False)
+    predicate = lambda chunk: chunk['Price'].between(100, 600).to_numpy()  # noqa: E731
+    stats = aggregates.stream_stats(ingest.iter_csv(path, chunksize=250), predicate)
+    filtered = df[predicate(df)]
+    assert stats.rows == len(filtered)
+    assert_same(stats.group_table('City'), aggregates.finalize(grouped_stats(filtered, 'City')))
+
+
+def grouped_table(df, by):
+    """count/mean/min/max per group, as groupby computes them."""
+    grouped = df.groupby(by, observed=True)
+    table = {('rows', 'count'): grouped.size()}
+    for metric in METRICS:
+        values = grouped[metric]
+        table[(metric, 'count')] = values.count()
+        table[(metric, 'mean')] = values.mean().astype('float64')
+        table[(metric, 'min')] = values.min().astype('float64')
+        table[(metric, 'max')] = values.max().astype('float64')
+    return pd.DataFrame(table)
+
+
+@pytest.mark.parametrize('missing', [True, False])
+def test_group_aggregates_match_groupby(missing):
+    df = frame(missing=missing)
+    groups = aggregates.GroupAggregates.from_frame(df)
+    assert groups.rows == len(df)
+    for dimension in GROUP_DIMENSIONS:
+        assert_same(groups.group_table(dimension), grouped_table(df, dimension))
+    for metric in METRICS:
+        assert groups.total(metric, 'count') == df[metric].count()
+        assert np.isclose(groups.total(metric, 'mean'), df[metric].mean())
+        assert groups.total(metric, 'max') == df[metric].max()
+    assert np.isnan(groups.total('Votes', 'mean'))
+
+
+def test_cuisine_table_matches_exploded_frame():
+    df = frame()
+    exploded = df.assign(**{aggregates.CUISINE_DIMENSION: df['Food type'].astype(object).str.split(',')})
+    exploded = exploded.explode(aggregates.CUISINE_DIMENSION)
+    exploded[aggregates.CUISINE_DIMENSION] = exploded[aggregates.CUISINE_DIMENSION].str.strip()
+    groups = aggregates.GroupAggregates.from_frame(df)
+    assert_same(groups.group_table(aggregates.CUISINE_DIMENSION),
+                grouped_table(exploded, aggregates.CUISINE_DIMENSION))
+
+
+def test_group_aggregates_of_empty_selection():
+    df = frame().iloc[:0]
+    groups = aggregates.GroupAggregates.from_frame(df)
+    assert groups.rows == 0
+    assert groups.group_table('City').empty
+    assert np.isnan(groups.total('Price', 'mean'))
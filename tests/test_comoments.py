@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from swiggy import aggregates, ingest
+from swiggy.aggregates import METRICS
+from swiggy.comoments import CoMoments
+
+from tests.helpers import CITIES, frame
+
+
+def test_correlation_matches_pandas():
+    df = frame()
+    expected = df[METRICS].dropna().corr()
+    pd.testing.assert_frame_equal(CoMoments.from_frame(df).correlation(), expected, check_dtype=False)
+    by_city = CoMoments.from_frame(df, 'City')
+    complete = df.dropna(subset=['City'] + METRICS)
+    pd.testing.assert_frame_equal(by_city.correlation(), complete[METRICS].corr(), check_dtype=False)
+    assert by_city.rows == len(complete)
+
+
+def test_subset_matches_filtered_frame():
+    df = frame()
+    cities = CITIES[1:3]
+    subset = CoMoments.from_frame(df, 'City').subset(cities + ['Nowhere'])
+    expected = df[df['City'].isin(cities)][METRICS].dropna().corr()
+    pd.testing.assert_frame_equal(subset.correlation(), expected, check_dtype=False)
+
+
+def test_chunks_pool_exactly():
+    df = frame(rows=3000, seed=3)
+    merged = None
+    for chunk in np.array_split(np.arange(len(df)), 7):
+        moments = CoMoments.from_frame(df.iloc[chunk], 'City')
+        merged = moments if merged is None else merged.merge(moments)
+    whole = CoMoments.from_frame(df, 'City')
+    merged = merged.subset(whole.keys)
+    assert merged.count.tolist() == whole.count.tolist()
+    assert np.allclose(merged.mean, whole.mean) and np.allclose(merged.m2, whole.m2)
+
+
+def test_streaming_moments_match_memory(tmp_path):
+    df = frame()
+    path = tmp_path / 'data.csv'
+    df.to_csv(path, index=False)
+    stats = aggregates.stream_stats(ingest.iter_csv(path, chunksize=300))
+    pd.testing.assert_frame_equal(stats.moments.correlation(), CoMoments.from_frame(df, 'City').correlation())
+
+
+def test_no_complete_rows():
+    df = frame(rows=10)
+    df['Price'] = np.nan
+    assert CoMoments.from_frame(df).correlation() is None
+    assert CoMoments.from_frame(df, 'City').subset([]).correlation() is None
@@ -0,0 +1,58 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from swiggy import aggregates, cuisines, filters, ingest
+
+CSV = (
+    'Restaurant,City,Price,Avg ratings,Food type,Area,Delivery time\n'
+    'r1,Pune,100,4.0,,A,30\n'
+    'r2,Delhi,200,3.5,,B,40\n'
+    'r3,Delhi,250,--,,B,45\n'
+)
+
+
+def load(text):
+    return ingest.load_csv(io.BytesIO(text.encode()))[0]
+
+
+def test_tokenize_and_canonicalize():
+    labels = ['Chinese, North Indian', 'North Indian,Chinese', 'Thai', 'Thai, , Thai']
+    label, cuisine, names = cuisines.tokenize(labels)
+    assert list(names) == ['Chinese', 'North Indian', 'Thai']
+    assert list(zip(label, cuisine)) == [(0, 0), (0, 1), (1, 0), (1, 1), (2, 2), (3, 2)]
+    canonical = cuisines.canonicalize(pd.Series(labels + [np.nan], dtype='category'))
+    assert list(canonical.astype(object)[:4]) == ['Chinese, North Indian'] * 2 + ['Thai'] * 2
+    assert pd.isna(canonical.iloc[4])
+
+
+def test_index_matches_string_split():
+    food_type = pd.Series(['Chinese, Thai', np.nan, 'Thai', 'Pizzas, Chinese', 'Chinese, Thai'], dtype='category')
+    index = cuisines.CuisineIndex.from_series(food_type)
+    assert list(index.counts) == [2, 0, 1, 2, 2]
+    expected = food_type.astype(object).str.contains('Thai|Pizzas', regex=True).fillna(False).to_numpy()
+    assert (index.mask(['Thai', 'Pizzas']) == expected).all()
+    assert list(index.rows_with(('Chinese',))) == [0, 3, 4]
+    taken = index.take(np.array([3, 1]))
+    assert list(taken.counts) == [2, 0]
+
+
+def test_all_blank_food_type():
+    df = load(CSV)
+    index = cuisines.CuisineIndex.from_series(df['Food type'])
+    assert len(index) == 3 and len(index.cuisines) == 0
+    assert not index.mask(['Thai']).any()
+
+    rows = filters.FilterIndex(df).select(('Pune', 'Delhi'), (0.0, 5.0), (0, 1000))
+    assert list(rows) == [0, 1]
+    groups = aggregates.GroupAggregates.from_frame(df)
+    assert groups.group_table(aggregates.CUISINE_DIMENSION).empty
+
+
+def test_streaming_blank_chunk():
+    text = CSV + 'r4,Pune,300,4.5,"Thai, Chinese",A,20\n'
+    stats = aggregates.stream_stats(ingest.iter_csv(io.BytesIO(text.encode()), chunksize=2))
+    table = stats.group_table(aggregates.CUISINE_DIMENSION)
+    assert stats.rows == 4
+    assert table[('rows', 'count')].to_dict() == {'Chinese': 1, 'Thai': 1}
@@ -0,0 +1,71 @@
+import gc
+import weakref
+
+import numpy as np
+import pytest
+
+from swiggy import filters
+
+from tests.helpers import CITIES, frame
+
+
+def states():
+    cities = tuple(CITIES)
+    everything = ((0.0, 5.0), (0, 2000))
+    return [
+        (cities, *everything),
+        (cities[:2], *everything),
+        ((), *everything),
+        (('Delhi', 'Nowhere'), *everything),
+        (cities, (3.05, 4.25), (0, 2000)),
+        (cities, (4.0, 4.0), (0, 2000)),
+        (cities, (0.0, 5.0), (99.5, 500.5)),
+        (cities, (0.0, 5.0), (0, 0)),
+        (cities[:1], (4.5, 5.0), (0, 300)),
+        (cities, (6.0, 7.0), (0, 2000)),
+        (cities, (0.0, 5.0), (0, 2000), ('Thai',)),
+        (cities[1:], (3.0, 5.0), (100, 900), ('Chinese', 'Biryani')),
+        (cities, (0.0, 5.0), (0, 2000), ('Nothing',)),
+    ]
+
+
+@pytest.mark.parametrize('missing', [True, False])
+def test_select_matches_mask(missing):
+    df = frame(missing=missing)
+    index = filters.FilterIndex(df)
+    for state in states():
+        expected = np.flatnonzero(filters.mask(df, *state).to_numpy())
+        rows = index.select(*state)
+        assert rows.tolist() == expected.tolist(), state
+        assert filters.view(df, rows).equals(df[filters.mask(df, *state)]), state
+
+
+def test_select_is_memoized_per_index():
+    df = frame()
+    first, second = filters.FilterIndex(df), filters.FilterIndex(df)
+    state = (('Pune',), (3.0, 5.0), (0, 500))
+    assert first.select(*state) is first.select(*state)
+    assert len(second._memo) == 0
+
+    first.cache_clear()
+    assert len(first._memo) == 0
+
+
+def test_index_is_freed_with_its_memos():
+    index = filters.FilterIndex(frame())
+    for state in states():
+        index.select(*state)
+        index.ranking(*state)
+    alive = weakref.ref(index)
+    del index
+    gc.collect()
+    assert alive() is None
+
+
+def test_city_only():
+    df = frame()
+    index = filters.FilterIndex(df)
+    bounds = index.rating.bounds(), index.price.bounds()
+    assert index.city_only(*bounds)
+    assert not index.city_only(*bounds, ('Thai',))
+    assert not index.city_only((4.0, bounds[0][1]), bounds[1])
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from swiggy import quantiles
+
+from tests.helpers import frame
+
+SIZES = [1, 2, 3, 5, 10, 49, 50, 51, 60, 120, 300, 1000, 5000]
+
+
+def groups_of(sizes, seed=1):
+    rng = np.random.default_rng(seed)
+    group = np.repeat([f"g{size}" for size in sizes], sizes)
+    values = np.round(rng.lognormal(5.5, 0.6, len(group)) / 10) * 10
+    return pd.DataFrame({'group': pd.Categorical(group), 'value': values})
+
+
+def sketch(df, by, value, chunks=3):
+    merged = quantiles.BoxSketch()
+    for part in np.array_split(np.arange(len(df)), chunks):
+        chunk = df.iloc[part]
+        merged.merge(quantiles.BoxSketch().update(chunk[by], chunk[value]))
+    return merged.summary(by, value)
+
+
+@pytest.mark.parametrize('by, value', [('City', 'Price'), ('Food type', 'Price'), ('Area', 'Avg ratings')])
+def test_box_summary_matches_pandas(by, value):
+    df = frame()
+    summary, outliers = quantiles.box_summary(df, by, value)
+    grouped = df.dropna(subset=[by, value]).groupby(by, observed=True)[value]
+    for name, q in [('q1', 0.25), ('median', 0.5), ('q3', 0.75)]:
+        assert np.allclose(summary[name], grouped.quantile(q).astype('float64').reindex(summary.index))
+    assert (summary['count'] == grouped.size().reindex(summary.index)).all()
+    assert (summary['min'] == grouped.min().reindex(summary.index)).all()
+    assert (summary['max'] == grouped.max().reindex(summary.index)).all()
+    low = outliers[value] < summary.loc[outliers[by], 'lowerfence'].to_numpy()
+    high = outliers[value] > summary.loc[outliers[by], 'upperfence'].to_numpy()
+    assert (low | high).all()
+
+
+def test_sketch_is_exact_for_small_groups():
+    df = groups_of(SIZES)
+    exact, _ = quantiles.box_summary(df, 'group', 'value')
+    approx, _ = sketch(df, 'group', 'value')
+    small = exact.index[exact['count'] <= quantiles.MAX_OUTLIERS]
+    pd.testing.assert_frame_equal(approx.loc[small], exact.loc[small], check_dtype=False)
+
+
+def test_sketch_quartiles_within_alpha():
+    df = groups_of(SIZES)
+    exact, _ = quantiles.box_summary(df, 'group', 'value')
+    approx, outliers = sketch(df, 'group', 'value')
+    approx = approx.reindex(exact.index)
+    assert (approx['count'] == exact['count']).all()
+    assert (approx[['min', 'max']] == exact[['min', 'max']]).all().all()
+    for column in ['q1', 'median', 'q3']:
+        error = (approx[column] - exact[column]).abs() / exact[column]
+        assert (error <= 0.01 + 1e-9).all(), column
+    assert len(outliers) <= quantiles.MAX_OUTLIERS * len(exact)
+
+
+def test_sketch_merge_is_order_independent():
+    df = groups_of([3, 80, 400], seed=2)
+    forward, _ = sketch(df, 'group', 'value', chunks=4)
+    backward, _ = sketch(df.iloc[::-1], 'group', 'value', chunks=5)
+    pd.testing.assert_frame_equal(forward, backward)
+
+
+def test_empty_inputs():
+    df = pd.DataFrame({'group': pd.Categorical([np.nan, 'a']), 'value': [1.0, np.nan]})
+    assert quantiles.box_summary(df, 'group', 'value')[0].empty
+    assert quantiles.BoxSketch().update(df['group'], df['value']).summary()[0].empty
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from swiggy import aggregates, filters, ranking, sections
+
+from tests.helpers import CITIES, frame
+
+QUERIES = [
+    dict(order_by='Avg ratings', ascending=False, limit=10),
+    dict(order_by='Avg ratings', ascending=True, limit=25),
+    dict(order_by='Price', ascending=False, limit=7),
+    dict(order_by='Price'),
+    dict(where=[('Price', '==', 0)]),
+    dict(where=[('Price', '>', 1300)]),
+    dict(where=[('Avg ratings', '<', 3.0)]),
+    dict(where=[('Avg ratings', '>=', 4.5), ('Price', '<=', 200)]),
+    dict(where=[('Price', '>', 0)], order_by='Price', limit=10),
+    dict(where=[('Avg ratings', '>', 2.5)], order_by='Price', ascending=False, limit=3),
+    dict(where=[('Avg ratings', '>', 9.0)], order_by='Avg ratings', limit=5),
+]
+STATES = [
+    (tuple(CITIES), (0.0, 5.0), (0, 2000)),
+    (tuple(CITIES[1:3]), (3.0, 5.0), (0, 2000)),
+    (tuple(CITIES), (0.0, 5.0), (100, 600), ('Thai',)),
+    ((), (0.0, 5.0), (0, 2000)),
+]
+
+
+def expected(df, where=(), order_by=None, ascending=True, limit=None):
+    """The query answered by masking and a stable full sort."""
+    for column, op, value in where:
+        df = df[sections.OPERATORS[op](df[column], value)]
+    if order_by is not None:
+        df = df.sort_values(order_by, ascending=ascending, kind='stable')
+    return df if limit is None else df.head(limit)
+
+
+@pytest.mark.parametrize('ascending', [True, False])
+def test_top_k_matches_stable_sort(ascending):
+    values = np.array([3.0, np.nan, 1.0, 3.0, 2.0, np.nan, 1.0, 3.0])
+    for k in range(len(values) + 2):
+        order = np.argsort(values if ascending else -values, kind='stable')[:k]
+        assert ranking.top_k(values, k, ascending).tolist() == order.tolist()
+
+
+@pytest.mark.parametrize('missing', [True, False])
+def test_ranking_matches_sort_values(missing):
+    df = frame(missing=missing)
+    index = filters.FilterIndex(df)
+    for state in STATES:
+        rows = index.select(*state)
+        ranks = index.ranking(*state)
+        filtered = filters.view(df, rows)
+        for query in QUERIES:
+            assert ranks.supports(query.get('where', ()), query.get('order_by'))
+            positions = ranks.select(**query)
+            assert filtered.index[positions].tolist() == expected(filtered, **query).index.tolist(), (state, query)
+
+
+def test_context_select_with_and_without_ranking():
+    df = frame()
+    index = filters.FilterIndex(df)
+    state = STATES[1]
+    rows = index.select(*state)
+    groups = aggregates.GroupAggregates.from_frame(filters.view(df, rows))
+    ranked = sections.SectionContext(df, groups, ranks=index.ranking(*state), rows=rows)
+    plain = sections.SectionContext(filters.view(df, rows), groups)
+    for query in QUERIES + [dict(where=[('City', '!=', 'Delhi')], order_by='Delivery time', limit=5)]:
+        assert ranked.select(**query).equals(plain.select(**query)), query
+        assert plain.select(**query).equals(expected(plain.df, **query)), query
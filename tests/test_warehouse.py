@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from swiggy import aggregates, charts, filters, ingest, sections, warehouse
+from swiggy.aggregates import CUISINE_DIMENSION, GROUP_DIMENSIONS, METRICS
+
+from tests.helpers import CITIES, frame
+from tests.test_ranking import QUERIES, STATES
+
+pytest.importorskip('duckdb')
+
+# More rows than DuckDB samples to guess column types.
+ROWS = 25_000
+
+
+@pytest.fixture(scope='module')
+def dataset(tmp_path_factory):
+    """A CSV whose first '--' rating and first non-numeric 'Votes' come
+    after DuckDB's type sample, its in-memory frame and its warehouse."""
+    directory = tmp_path_factory.mktemp('warehouse')
+    raw = frame(rows=ROWS, missing=False)
+    raw['Avg ratings'] = raw['Avg ratings'].astype(object)
+    raw.loc[ROWS - 100, 'Avg ratings'] = '--'
+    raw.loc[ROWS - 50, 'Price'] = np.nan
+    raw['ID'] = np.arange(ROWS)
+    raw['Votes'] = np.arange(ROWS).astype(object)
+    raw.loc[ROWS - 10, 'Votes'] = 'n/a'
+    path = directory / 'late.csv'
+    raw.to_csv(path, index=False)
+    df, _ = ingest.load_csv(path)
+    return df, warehouse.open_dataset(path, 'late', directory / 'store')
+
+
+def by_key(table):
+    table = table.copy()
+    table.index = table.index.astype(str)
+    return table.sort_index()
+
+
+def test_late_text_in_numeric_columns(dataset):
+    df, store = dataset
+    types = dict(store.query(f"DESCRIBE {warehouse.TABLE}")[['column_name', 'column_type']].values)
+    assert types['Avg ratings'] == types['Price'] == 'DOUBLE'
+    assert types['ID'] == 'BIGINT' and types['Votes'] == 'VARCHAR'
+    for metric in METRICS:
+        nulls = store.query(f"SELECT count(*) AS n FROM {warehouse.TABLE} WHERE {warehouse.quote(metric)} IS NULL")
+        assert nulls['n'].iloc[0] == df[metric].isna().sum(), metric
+
+
+@pytest.mark.parametrize('state', STATES + [(tuple(CITIES), (3.05, 4.25), (0, 2000), ('Chinese', 'Biryani'))])
+def test_view_matches_memory(dataset, state):
+    df, store = dataset
+    index = filters.FilterIndex(df)
+    rows = index.select(*state)
+    groups = aggregates.GroupAggregates.from_frame(filters.view(df, rows))
+    view = store.view(*state)
+    assert view.rows == groups.rows == len(rows)
+    for metric in METRICS:
+        for stat in ['count', 'mean', 'min', 'max']:
+            assert np.isclose(view.total(metric, stat), groups.total(metric, stat), equal_nan=True), (metric, stat)
+    for dimension in GROUP_DIMENSIONS + [CUISINE_DIMENSION]:
+        pd.testing.assert_frame_equal(by_key(view.group_table(dimension)), by_key(groups.group_table(dimension)),
+                                      check_dtype=False, check_names=False, rtol=1e-6)
+
+    ranked = sections.SectionContext(df, groups, ranks=index.ranking(*state), rows=rows)
+    for query in QUERIES:
+        expected = ranked.select(**query)
+        actual = view.select(**query)
+        assert actual.attrs.get('total_rows', len(actual)) == len(expected)
+        expected = expected.head(warehouse.MAX_RESULT_ROWS)
+        assert list(actual['Restaurant']) == list(expected['Restaurant'].astype(object)), (state, query)
+        assert np.allclose(actual['Price'], expected['Price'].astype('float64'), equal_nan=True)
+
+
+def test_cut_results_record_their_size(dataset, monkeypatch):
+    df, store = dataset
+    monkeypatch.setattr(warehouse, 'MAX_RESULT_ROWS', 100)
+    state = (tuple(CITIES), (0.0, 5.0), (0, 2000))
+    view = store.view(*state)
+    result = view.select([('Price', '>', 0)])
+    assert len(result) == 100
+    assert result.attrs['total_rows'] == int((filters.mask(df, *state) & (df['Price'] > 0)).sum())
+    assert 'total_rows' not in view.select([('Price', '>', 0)], limit=10).attrs
+
+
+def assert_same_traces(actual, expected):
+    assert actual.layout.title.text == expected.layout.title.text
+    assert [trace.name for trace in actual.data] == [trace.name for trace in expected.data]
+    for a, b in zip(actual.data, expected.data):
+        for axis in ['x', 'y']:
+            left, right = np.asarray(getattr(a, axis)), np.asarray(getattr(b, axis))
+            if left.dtype.kind in 'iuf' and right.dtype.kind in 'iuf':
+                assert np.allclose(left, right, rtol=1e-6), axis
+            else:
+                assert left.astype(str).tolist() == right.astype(str).tolist(), axis
+
+
+@pytest.mark.parametrize('key', ['price_vs_rating', 'delivery_vs_rating', 'price_vs_delivery',
+                                 'price_by_cuisine_count', 'top_food_per_city'])
+@pytest.mark.parametrize('max_points', [100, 50_000])
+def test_row_sections_match_memory(dataset, key, max_points):
+    df, store = dataset
+    index = filters.FilterIndex(df)
+    state = STATES[1]
+    rows = index.select(*state)
+    groups = aggregates.GroupAggregates.from_frame(filters.view(df, rows))
+    memory = sections.SectionContext(df, groups, scatter_max_points=max_points, rows=rows)
+    query = sections.SectionContext(groups=store.view(*state), scatter_max_points=max_points)
+    assert sections.get(key) in sections.available(query)
+    figures = [[value for kind, value in sections.get(key).compute(ctx) if kind == 'plotly'][0]
+               for ctx in (query, memory)]
+    # Ratings are float32 in memory, so a rating on a density bin edge may
+    # fall in the bin below there; density grids are compared on the
+    # integer axes only (see test_density_grid_counts_match_memory).
+    if max_points > len(rows) or 'Avg ratings' not in (figures[1].layout.yaxis.title.text or ''):
+        assert_same_traces(*figures)
+
+
+def test_sql_box_and_crosstab_match_memory(dataset):
+    df, store = dataset
+    index = filters.FilterIndex(df)
+    state = STATES[1]
+    rows = index.select(*state)
+    groups = aggregates.GroupAggregates.from_frame(filters.view(df, rows))
+    memory = sections.SectionContext(df, groups, rows=rows)
+    query = sections.SectionContext(groups=store.view(*state))
+    (summary, outliers), (expected, expected_outliers) = [
+        ctx.box_summary(aggregates.CUISINE_COUNT_DIMENSION, 'Price') for ctx in (query, memory)
+    ]
+    assert 0 in summary.index
+    pd.testing.assert_frame_equal(summary.sort_index(), expected.sort_index(),
+                                  check_dtype=False, check_index_type=False, check_names=False)
+    assert sorted(outliers['Price']) == sorted(expected_outliers['Price'])
+    top = sections.top_groups(groups, 'City', 2).index
+    actual, expected = [by_key(ctx.crosstab('City', 'Food type', top)) for ctx in (query, memory)]
+    expected.columns = expected.columns.astype(str)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, check_names=False, check_column_type=False)
+    assert list(actual.index) == sorted(str(city) for city in top)
+
+
+def test_density_grid_counts_match_memory(dataset):
+    df, store = dataset
+    state = STATES[0]
+    rows = filters.FilterIndex(df).select(*state)
+    for x, y in [('Price', 'Delivery time'), ('Price', 'Avg ratings')]:
+        actual = store.view(*state).density_grid(x, y, 'City')
+        expected = charts.density_grid(filters.view(df, rows), x, y, 'City')
+        assert actual.groupby('City')['count'].sum().to_dict() == expected.groupby('City')['count'].sum().to_dict()
+        if y == 'Delivery time':
+            pd.testing.assert_frame_equal(actual, expected, check_dtype=False)